@@ -0,0 +1,128 @@
+"""Проверка программ прямо из сжатых файлов и tar-архивов.
+
+Поддерживаются .gz, .xz, .bz2 (один файл) и tar-архивы с любым из этих
+сжатий. Члены архива распаковываются потоково средствами стандартной
+библиотеки и проверяются пулом процессов без временных файлов; при
+workers=0 текст подаётся в StreamLexer кусками прямо при распаковке.
+Некорректные байты UTF-8 в обоих случаях заменяются на U+FFFD.
+"""
+
+import bz2
+import fnmatch
+import gzip
+import lzma
+import os
+import tarfile
+import time
+from concurrent.futures import (
+    ALL_COMPLETED,
+    FIRST_COMPLETED,
+    ProcessPoolExecutor,
+    wait,
+)
+
+from .parser import Parser, validate_text
+from .stream import StreamLexer
+
+CHUNK_SIZE = 64 * 1024
+# Одинаковая обработка некорректного UTF-8 при любом числе воркеров
+DECODE_ERRORS = "replace"
+OPENERS = {".gz": gzip.open, ".xz": lzma.open, ".bz2": bz2.open}
+COMPRESSED_SUFFIXES = (".gz", ".tgz", ".xz", ".txz", ".bz2", ".tbz2", ".tar")
+
+
+def is_archive(path):
+    return str(path).lower().endswith(COMPRESSED_SUFFIXES)
+
+
+def iter_members(path, pattern=None):
+    """Пары (имя члена, двоичный поток с распакованным содержимым)."""
+    path = os.fspath(path)
+    if tarfile.is_tarfile(path):
+        with tarfile.open(path, "r|*") as tar:
+            for member in tar:
+                name = os.path.basename(member.name)
+                if member.isfile() and (pattern is None or fnmatch.fnmatch(name, pattern)):
+                    yield member.name, tar.extractfile(member)
+        return
+    suffix = os.path.splitext(path)[1].lower()
+    opener = OPENERS.get(suffix, open)
+    with opener(path, "rb") as file:
+        name = os.path.basename(path[: -len(suffix)] if suffix in OPENERS else path)
+        yield name, file
+
+
+def validate_bytes(data):
+    """Проверка содержимого члена архива в процессе пула."""
+    return validate_text(data.decode("UTF-8", errors=DECODE_ERRORS))
+
+
+def validate_stream_file(file, chunk_size=CHUNK_SIZE):
+    """Проверка потока по мере распаковки; (ошибка или None, число байт)."""
+    lexer = StreamLexer(errors=DECODE_ERRORS)
+    size = 0
+    try:
+        while chunk := file.read(chunk_size):
+            size += len(chunk)
+            lexer.feed(chunk)
+        lexer.close()
+        Parser(lexer).parse()
+    except Exception as e:
+        # Дочитываем член, чтобы потоковое чтение архива продолжилось верно
+        while chunk := file.read(chunk_size):
+            size += len(chunk)
+        return str(e), size
+    return None, size
+
+
+def validate_archives(paths, workers=None, pattern=None, max_pending=None):
+    """Проверка всех членов архивов.
+
+    Возвращает (results, summary): results — список словарей archive,
+    member, bytes, error в порядке завершения; summary — число членов,
+    объём распакованного текста, время и пропускная способность в МБ/с.
+    """
+    started = time.perf_counter()
+    results = []
+    if workers == 0:
+        for path in paths:
+            for name, file in iter_members(path, pattern):
+                error, size = validate_stream_file(file)
+                results.append(
+                    {"archive": str(path), "member": name, "bytes": size, "error": error}
+                )
+    else:
+        with ProcessPoolExecutor(workers) as pool:
+            limit = max_pending or 4 * (workers or os.cpu_count() or 1)
+            pending = {}
+
+            def collect(return_when):
+                done, _ = wait(pending, return_when=return_when)
+                for future in done:
+                    record = pending.pop(future)
+                    try:
+                        record["error"] = future.result()
+                    except Exception as e:
+                        record["error"] = str(e)
+                    results.append(record)
+
+            for path in paths:
+                for name, file in iter_members(path, pattern):
+                    data = file.read()
+                    record = {"archive": str(path), "member": name, "bytes": len(data)}
+                    pending[pool.submit(validate_bytes, data)] = record
+                    if len(pending) >= limit:
+                        collect(FIRST_COMPLETED)
+            if pending:
+                collect(ALL_COMPLETED)
+
+    elapsed = time.perf_counter() - started
+    total = sum(record["bytes"] for record in results)
+    summary = {
+        "members": len(results),
+        "failed": sum(1 for record in results if record["error"]),
+        "bytes": total,
+        "seconds": elapsed,
+        "mb_per_s": total / elapsed / 1e6 if elapsed else 0.0,
+    }
+    return results, summary
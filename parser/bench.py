@@ -0,0 +1,47 @@
+"""Сравнение разбора новой парой Lexer/Parser и переиспользуемой через reset().
+
+reset() экономит только создание объектов (таблиц, словарей, SymbolTable):
+около 0.8 мкс на текст при ~31 мкс на лексический и синтаксический анализ
+короткой программы, то есть в пределах погрешности. Токены и список
+токенов создаются заново в обоих случаях, поэтому пул не ускоряет разбор;
+его смысл — общий Limits и отсутствие повторной настройки экземпляров.
+Строки "setup" показывают стоимость одной только подготовки пары.
+"""
+
+import timeit
+
+from .lexer import Lexer
+from .parser import Parser
+
+SNIPPET = """program var x: integer; begin x as 1 end."""
+
+
+def fresh(text):
+    """Разбор с созданием новой пары Lexer/Parser на каждый текст."""
+    Parser(Lexer(text)).parse()
+
+
+def pooled(parser, text):
+    """Разбор с переиспользованием одной пары Lexer/Parser."""
+    parser.reset(text).parse()
+
+
+def main(number=20000, repeat=5):
+    parser = Parser(Lexer(""))
+    cases = {
+        "fresh": lambda: fresh(SNIPPET),
+        "pooled": lambda: pooled(parser, SNIPPET),
+        "setup fresh": lambda: Parser(Lexer("")),
+        "setup pooled": lambda: parser.reset(""),
+    }
+    results = {
+        name: min(timeit.repeat(case, number=number, repeat=repeat))
+        for name, case in cases.items()
+    }
+    for name, total in results.items():
+        print(f"{name:<13}| {total / number * 1e6:8.2f} us/snippet")
+    return results
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,206 @@
+"""Выражения программ в виде DAG с объединением одинаковых поддеревьев.
+
+DagParser строит узлы через ExprDag.intern в методах operand() и
+operation(), которые вызывает грамматика Parser: узлы с одинаковой
+операцией, значением и дочерними узлами создаются один раз и разделяются
+всеми выражениями корпуса. Идентификатор различается вместе с объявленным
+типом, поэтому тип и константное значение узла корректны между файлами.
+Они вычисляются при создании узла по уже готовым дочерним узлам, без
+рекурсии по глубине выражения.
+
+    python -m parser.dag FILE...
+"""
+
+import argparse
+import sys
+
+from .lexer import ADD_OPS_TABLE, MUL_OPS_TABLE, REL_OP_TABLE, UOPS_TABLE, Lexer
+from .parser import Parser
+
+_UNKNOWN = object()
+
+RADIXES = {"b": 2, "o": 8, "h": 16, "d": 10}
+BOOLEAN_OPS = frozenset(("or", "and", "~"))
+# Имена операций по номеру таблицы токена операции
+OPERATOR_TABLES = {2: REL_OP_TABLE, 3: ADD_OPS_TABLE, 4: MUL_OPS_TABLE, 5: UOPS_TABLE}
+
+
+class Node:
+    __slots__ = ("id", "op", "value", "children", "type", "constant")
+
+    def __init__(self, id, op, value, children, type=_UNKNOWN):
+        self.id = id
+        self.op = op  # "id", "num", "bool" или имя операции
+        self.value = value
+        self.children = children
+        # Тип выражения: integer, real, boolean или None
+        self.type = self._infer_type() if type is _UNKNOWN else type
+        # Значение выражения, если оно вычислимо без переменных, иначе None
+        self.constant = self._fold()
+
+    def _infer_type(self):
+        if self.op == "num":
+            if self.value[-1].lower() in RADIXES:
+                return "integer"
+            if "." in self.value or "e" in self.value.lower():
+                return "real"
+            return "integer"
+        if self.op == "bool" or self.op in BOOLEAN_OPS or self.op in REL_OP_TABLE:
+            return "boolean"
+        types = {child.type for child in self.children}
+        if None in types or "boolean" in types:
+            return None
+        return "real" if "real" in types or self.op == "div" else "integer"
+
+    def _fold(self):
+        if self.op == "num":
+            return parse_number_literal(self.value)
+        if self.op == "bool":
+            return self.value == "true"
+        if self.op == "id":
+            return None
+        values = [child.constant for child in self.children]
+        if None in values:
+            return None
+        try:
+            return OPERATIONS[self.op](*values)
+        except (ArithmeticError, TypeError):
+            return None
+
+    def __repr__(self):
+        if not self.children:
+            return f"{self.op}({self.value})"
+        return f"{self.op}({', '.join(repr(child) for child in self.children)})"
+
+
+def parse_number_literal(text):
+    """Значение числового литерала с учётом суффикса системы счисления."""
+    try:
+        radix = RADIXES.get(text[-1].lower())
+        if radix is not None:
+            return int(text[:-1], radix)
+        if "." in text or "e" in text.lower():
+            return float(text)
+        return int(text)
+    except ValueError:
+        return None
+
+
+OPERATIONS = {
+    "NE": lambda a, b: a != b,
+    "EQ": lambda a, b: a == b,
+    "LT": lambda a, b: a < b,
+    "LE": lambda a, b: a <= b,
+    "GT": lambda a, b: a > b,
+    "GE": lambda a, b: a >= b,
+    "plus": lambda a, b: a + b,
+    "min": lambda a, b: a - b,
+    "or": lambda a, b: bool(a or b),
+    "mult": lambda a, b: a * b,
+    "div": lambda a, b: a / b,
+    "and": lambda a, b: bool(a and b),
+    "~": lambda a: not a,
+}
+
+
+def node_size(node):
+    return sys.getsizeof(node) + sys.getsizeof(node.children)
+
+
+class ExprDag:
+    """Таблица уникальных узлов выражений."""
+
+    def __init__(self):
+        self.nodes = []
+        self._index = {}
+        # Сколько узлов было бы в обычных деревьях и сколько они бы заняли
+        self.references = 0
+        self.tree_bytes = 0
+
+    def intern(self, op, value=None, children=(), type=_UNKNOWN):
+        key = (op, value, type, tuple(child.id for child in children))
+        node = self._index.get(key)
+        if node is None:
+            node = Node(len(self.nodes), op, value, tuple(children), type)
+            self.nodes.append(node)
+            self._index[key] = node
+        self.references += 1
+        self.tree_bytes += node_size(node)
+        return node
+
+    def variable(self, name, type_name):
+        return self.intern("id", sys.intern(name), type=type_name)
+
+    def stats(self):
+        """Степень дедупликации и оценка сэкономленной памяти в байтах."""
+        dag_bytes = sum(node_size(node) for node in self.nodes)
+        index_bytes = sys.getsizeof(self._index) + sum(
+            sys.getsizeof(key) + sys.getsizeof(key[3]) for key in self._index
+        )
+        unique = len(self.nodes)
+        return {
+            "references": self.references,
+            "unique": unique,
+            "dedup_ratio": self.references / unique if unique else 0.0,
+            "tree_bytes": self.tree_bytes,
+            "dag_bytes": dag_bytes + index_bytes,
+            "saved_bytes": self.tree_bytes - dag_bytes - index_bytes,
+        }
+
+
+class DagParser(Parser):
+    """Parser, строящий для каждого выражения программы узел ExprDag."""
+
+    def __init__(self, lexer, dag=None):
+        self.dag = dag if dag is not None else ExprDag()
+        self.roots = []
+        super().__init__(lexer)
+
+    def reset(self, text):
+        self.roots = []
+        return super().reset(text)
+
+    def operand(self, token):
+        if token.table_num == 8:
+            type_token = self.symbol_table.lookup(token.value)
+            return self.dag.variable(token.value, type_token.value.lower())
+        if token.table_num == 7:
+            return self.dag.intern("num", sys.intern(token.value))
+        return self.dag.intern("bool", token.value.lower())
+
+    def operation(self, token, operands):
+        op = OPERATOR_TABLES[token.table_num][token.lexeme_num - 1]
+        return self.dag.intern(op, children=operands)
+
+    def root(self, node):
+        self.roots.append(node)
+
+
+def build_corpus(paths, encoding="UTF-8"):
+    """Общий DAG выражений всех файлов и ошибки разбора по путям."""
+    dag = ExprDag()
+    parser = DagParser(Lexer(""), dag)
+    errors = {}
+    for path in paths:
+        with open(path, "r", encoding=encoding) as file:
+            text = file.read()
+        try:
+            parser.reset(text).parse()
+        except Exception as e:
+            errors[str(path)] = str(e)
+    return dag, errors
+
+
+def main(argv=None):
+    arg_parser = argparse.ArgumentParser(prog="python -m parser.dag")
+    arg_parser.add_argument("paths", nargs="+")
+    args = arg_parser.parse_args(argv)
+    dag, errors = build_corpus(args.paths)
+    for path, error in errors.items():
+        print(f"{path}: {error}")
+    for name, value in dag.stats().items():
+        print(f"{name:<12}| {value:.2f}" if isinstance(value, float) else f"{name:<12}| {value}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,414 @@
+"""Распределённая проверка корпуса: координатор и удалённые воркеры.
+
+Координатор делит список файлов на единицы работы и раздаёт их
+воркерам, подключившимся по TCP. Сообщения — JSON, по одному в строке:
+
+    воркер -> координатор  hello, heartbeat, result
+    координатор -> воркер  unit, done
+    любой клиент           status -> progress
+
+Воркер без heartbeat дольше heartbeat_timeout секунд или разорвавший
+соединение считается выбывшим, его единица возвращается в очередь;
+сам воркер при этом переподключается. Некорректные сообщения закрывают
+соединение.
+Повторный результат по уже завершённой единице игнорируется. Файлы
+читаются воркерами по путям, поэтому корпус должен быть доступен им
+по тем же путям (общая файловая система).
+
+    python -m parser.distributed coordinator ROOT --port 9000
+    python -m parser.distributed worker HOST 9000
+    python -m parser.distributed status HOST 9000
+"""
+
+import argparse
+import asyncio
+import json
+import multiprocessing
+import socket
+import threading
+import time
+from collections import deque
+from pathlib import Path
+
+from .parser import validate_text
+
+DEFAULT_UNIT_SIZE = 100
+DEFAULT_HEARTBEAT_INTERVAL = 1.0
+DEFAULT_HEARTBEAT_TIMEOUT = 5.0
+DEFAULT_RECONNECTS = 3
+
+
+def encode(message):
+    return (json.dumps(message, ensure_ascii=False) + "\n").encode("UTF-8")
+
+
+class WorkerState:
+    def __init__(self, worker_id, writer, now):
+        self.id = worker_id
+        self.writer = writer
+        self.connected_at = now
+        self.last_seen = now
+        self.unit = None
+        self.alive = True
+        self.units = 0
+        self.files = 0
+        self.bytes = 0
+        self.busy_seconds = 0.0
+
+
+class Coordinator:
+    def __init__(
+        self,
+        paths,
+        unit_size=DEFAULT_UNIT_SIZE,
+        host="127.0.0.1",
+        port=0,
+        heartbeat_timeout=DEFAULT_HEARTBEAT_TIMEOUT,
+    ):
+        paths = [str(path) for path in paths]
+        self.units = {
+            uid: paths[start : start + unit_size]
+            for uid, start in enumerate(range(0, len(paths), unit_size))
+        }
+        self.host = host
+        self.port = port
+        self.heartbeat_timeout = heartbeat_timeout
+        self.pending = deque(self.units)
+        self.completed = set()
+        self.results = {}  # path -> None или текст ошибки
+        self.workers = {}
+        self.reassigned = 0
+        self.started_at = None
+        self._finished = None
+
+    def progress(self):
+        """Состояние проверки и производительность каждого воркера."""
+        now = time.monotonic()
+        elapsed = now - self.started_at if self.started_at else 0.0
+        return {
+            "units_total": len(self.units),
+            "units_done": len(self.completed),
+            "units_pending": len(self.pending),
+            "files_done": len(self.results),
+            "failed": sum(1 for error in self.results.values() if error),
+            "reassigned": self.reassigned,
+            "elapsed": elapsed,
+            "workers": {
+                state.id: {
+                    "alive": state.alive,
+                    "unit": state.unit,
+                    "units": state.units,
+                    "files": state.files,
+                    "files_per_s": (
+                        state.files / state.busy_seconds if state.busy_seconds else 0.0
+                    ),
+                    "mb_per_s": (
+                        state.bytes / state.busy_seconds / 1e6
+                        if state.busy_seconds
+                        else 0.0
+                    ),
+                }
+                for state in self.workers.values()
+            },
+        }
+
+    async def serve(self, on_started=None):
+        """Раздача работы до завершения всех единиц; возвращает результаты."""
+        self._finished = asyncio.Event()
+        self.started_at = time.monotonic()
+        server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = server.sockets[0].getsockname()[1]
+        if on_started is not None:
+            on_started(self.port)
+        if not self.units:
+            self._finished.set()
+        monitor = asyncio.create_task(self._monitor())
+        async with server:
+            await self._finished.wait()
+            monitor.cancel()
+            # Соединения закрываются до выхода: сервер ждёт их завершения
+            for state in list(self.workers.values()):
+                if state.alive:
+                    await self._send(state, {"type": "done"})
+                    state.writer.close()
+        return self.results
+
+    async def _send(self, state, message):
+        try:
+            state.writer.write(encode(message))
+            await state.writer.drain()
+        except (ConnectionError, RuntimeError):
+            self._drop(state)
+
+    async def _handle(self, reader, writer):
+        try:
+            message = json.loads(await reader.readline())
+            kind = message.get("type")
+        except (ConnectionError, ValueError, AttributeError):
+            # Пустое соединение, не JSON или не объект
+            writer.close()
+            return
+        if kind == "status":
+            writer.write(encode({"type": "progress", **self.progress()}))
+            await writer.drain()
+            writer.close()
+            return
+
+        worker_id = message.get("worker") or "%s:%s" % writer.get_extra_info("peername")[:2]
+        while worker_id in self.workers:
+            worker_id += "'"
+        state = WorkerState(worker_id, writer, time.monotonic())
+        self.workers[worker_id] = state
+        try:
+            await self._dispatch(state)
+            while state.alive and (line := await reader.readline()):
+                message = json.loads(line)
+                state.last_seen = time.monotonic()
+                if message["type"] == "result":
+                    self._complete(state, message)
+                    await self._dispatch(state)
+        except (ConnectionError, ValueError, KeyError, TypeError):
+            # Разрыв соединения или некорректное сообщение воркера
+            pass
+        finally:
+            self._drop(state)
+            writer.close()
+
+    async def _dispatch(self, state):
+        """Выдача воркеру следующей единицы, если он свободен."""
+        if not state.alive or state.unit is not None:
+            return
+        if self.pending:
+            state.unit = self.pending.popleft()
+            await self._send(state, {"type": "unit", "unit": state.unit, "paths": self.units[state.unit]})
+        elif len(self.completed) == len(self.units):
+            self._finished.set()
+
+    def _complete(self, state, message):
+        """Учёт результата единицы, выданной этому воркеру.
+
+        Результат по чужой или неизвестной единице игнорируется. Если он
+        покрывает не все файлы единицы, единица возвращается в очередь,
+        а воркер исключается (ValueError).
+        """
+        uid = message["unit"]
+        if state.unit is None or uid != state.unit:
+            return
+        results = dict(message["results"])
+        size = int(message["bytes"])
+        seconds = float(message["seconds"])
+        state.unit = None
+        if uid in self.completed:
+            return
+        paths = self.units[uid]
+        missing = [path for path in paths if path not in results]
+        if missing:
+            self.pending.appendleft(uid)
+            self.reassigned += 1
+            raise ValueError(f"Result for unit {uid} misses {len(missing)} files")
+        self.completed.add(uid)
+        for path in paths:
+            self.results[path] = results[path]
+        state.units += 1
+        state.files += len(paths)
+        state.bytes += size
+        state.busy_seconds += seconds
+        if len(self.completed) == len(self.units):
+            self._finished.set()
+
+    def _drop(self, state):
+        """Исключение воркера; его незавершённая единица уходит в очередь."""
+        if not state.alive:
+            return
+        state.alive = False
+        if state.unit is not None and state.unit not in self.completed:
+            self.pending.appendleft(state.unit)
+            self.reassigned += 1
+        state.unit = None
+        state.writer.close()
+        for other in self.workers.values():
+            if other.alive and other.unit is None:
+                asyncio.ensure_future(self._dispatch(other))
+
+    async def _monitor(self):
+        while True:
+            await asyncio.sleep(self.heartbeat_timeout / 4)
+            now = time.monotonic()
+            for state in list(self.workers.values()):
+                if state.alive and now - state.last_seen > self.heartbeat_timeout:
+                    self._drop(state)
+
+
+def validate_unit(paths):
+    """Проверка файлов единицы работы: (результаты, байты, секунды)."""
+    started = time.perf_counter()
+    results = []
+    size = 0
+    for path in paths:
+        try:
+            with open(path, "r", encoding="UTF-8") as file:
+                text = file.read()
+        except OSError as e:
+            results.append((path, str(e)))
+            continue
+        size += len(text)
+        results.append((path, validate_text(text)))
+    return results, size, time.perf_counter() - started
+
+
+def _worker_session(host, port, worker_id, heartbeat_interval):
+    """Одно подключение к координатору: (получен ли done, число единиц)."""
+    units = 0
+    with socket.create_connection((host, port)) as sock:
+        lock = threading.Lock()
+        stop = threading.Event()
+
+        def send(message):
+            with lock:
+                sock.sendall(encode(message))
+
+        def heartbeat():
+            while not stop.wait(heartbeat_interval):
+                try:
+                    send({"type": "heartbeat"})
+                except OSError:
+                    return
+
+        try:
+            send({"type": "hello", "worker": worker_id})
+            threading.Thread(target=heartbeat, daemon=True).start()
+            for line in sock.makefile("rb"):
+                message = json.loads(line)
+                if message["type"] == "done":
+                    return True, units
+                if message["type"] == "unit":
+                    results, size, seconds = validate_unit(message["paths"])
+                    send(
+                        {
+                            "type": "result",
+                            "unit": message["unit"],
+                            "results": results,
+                            "bytes": size,
+                            "seconds": seconds,
+                        }
+                    )
+                    units += 1
+        except OSError:
+            # Координатор разорвал соединение, например за пропущенный heartbeat
+            pass
+        finally:
+            stop.set()
+    return False, units
+
+
+def run_worker(
+    host,
+    port,
+    worker_id=None,
+    heartbeat_interval=DEFAULT_HEARTBEAT_INTERVAL,
+    reconnects=DEFAULT_RECONNECTS,
+):
+    """Цикл воркера: получение единиц, проверка, отправка результатов.
+
+    После разрыва соединения воркер подключается заново, но не более
+    reconnects раз подряд без выполненной единицы. Если координатор
+    недоступен (например, уже завершил работу), воркер просто выходит.
+    """
+    failures = 0
+    while True:
+        try:
+            done, units = _worker_session(host, port, worker_id, heartbeat_interval)
+        except OSError:
+            return
+        if done:
+            return
+        failures = 0 if units else failures + 1
+        if failures > reconnects:
+            return
+
+
+def query_status(host, port):
+    """Текущий прогресс координатора."""
+    with socket.create_connection((host, port)) as sock:
+        sock.sendall(encode({"type": "status"}))
+        return json.loads(sock.makefile("rb").readline())
+
+
+def run_local(paths, workers=2, **options):
+    """Координатор и workers локальных процессов-воркеров через loopback."""
+
+    async def main():
+        started = asyncio.get_running_loop().create_future()
+        coordinator = Coordinator(paths, host="127.0.0.1", port=0, **options)
+        serving = asyncio.create_task(coordinator.serve(on_started=started.set_result))
+        port = await started
+        processes = [
+            multiprocessing.Process(target=run_worker, args=("127.0.0.1", port, f"local-{i}"))
+            for i in range(workers)
+        ]
+        for process in processes:
+            process.start()
+        results = await serving
+        for process in processes:
+            await asyncio.to_thread(process.join)
+        return coordinator, results
+
+    return asyncio.run(main())
+
+
+async def _report_progress(coordinator, interval):
+    while True:
+        await asyncio.sleep(interval)
+        progress = coordinator.progress()
+        print(
+            f"{progress['units_done']}/{progress['units_total']} units, "
+            f"{progress['files_done']} files, {len(progress['workers'])} workers"
+        )
+
+
+def main(argv=None):
+    arg_parser = argparse.ArgumentParser(prog="python -m parser.distributed")
+    commands = arg_parser.add_subparsers(dest="command", required=True)
+    coordinator_cmd = commands.add_parser("coordinator")
+    coordinator_cmd.add_argument("root")
+    coordinator_cmd.add_argument("--pattern", default="*.txt")
+    coordinator_cmd.add_argument("--host", default="0.0.0.0")
+    coordinator_cmd.add_argument("--port", type=int, default=9000)
+    coordinator_cmd.add_argument("--unit-size", type=int, default=DEFAULT_UNIT_SIZE)
+    coordinator_cmd.add_argument("--heartbeat-timeout", type=float, default=DEFAULT_HEARTBEAT_TIMEOUT)
+    for name in ("worker", "status"):
+        command = commands.add_parser(name)
+        command.add_argument("host")
+        command.add_argument("port", type=int)
+    args = arg_parser.parse_args(argv)
+
+    if args.command == "worker":
+        run_worker(args.host, args.port, socket.gethostname())
+    elif args.command == "status":
+        print(json.dumps(query_status(args.host, args.port), indent=2))
+    else:
+        paths = sorted(str(path.resolve()) for path in Path(args.root).rglob(args.pattern))
+        coordinator = Coordinator(
+            paths,
+            unit_size=args.unit_size,
+            host=args.host,
+            port=args.port,
+            heartbeat_timeout=args.heartbeat_timeout,
+        )
+
+        async def serve():
+            reporter = asyncio.create_task(_report_progress(coordinator, 5.0))
+            try:
+                return await coordinator.serve()
+            finally:
+                reporter.cancel()
+
+        results = asyncio.run(serve())
+        for path, error in sorted(results.items()):
+            if error:
+                print(f"{path}: {error}")
+        print(json.dumps(coordinator.progress(), indent=2))
+
+
+if __name__ == "__main__":
+    main()
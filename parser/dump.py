@@ -0,0 +1,198 @@
+"""Быстрый вывод списка токенов в текстовом, CSV и JSON Lines форматах.
+
+Группа и тип токена вычисляются один раз для каждой пары
+(table_num, lexeme_num) методами Token, поэтому текстовый формат
+совпадает с Token.__str__, но не требует вызовов и f-строки на токен.
+"""
+
+import csv
+import json
+import sys
+
+from .lexer import (
+    ADD_OPS_TABLE,
+    DELIMITERS_TABLE,
+    KEYWORDS_TABLE,
+    MUL_OPS_TABLE,
+    REL_OP_TABLE,
+    UOPS_TABLE,
+    Token,
+)
+from .stream import StreamLexer
+
+FORMATS = ("text", "csv", "jsonl")
+CSV_FIELDS = ("table_num", "lexeme_num", "line", "column", "group", "type", "value")
+BUFFER_TOKENS = 4096
+CHUNK_SIZE = 64 * 1024
+
+# Строка Token.__str__ для токенов таблицы 0 (EOF и неизвестные символы)
+EOF_LINE = str(Token(0, 0, 0, 0, "EOF"))
+
+
+def _build_names():
+    """(table_num, lexeme_num) -> (группа, тип); для 7 и 8 ключ (n, None)."""
+    samples = {
+        1: KEYWORDS_TABLE,
+        2: REL_OP_TABLE,
+        3: ADD_OPS_TABLE,
+        4: MUL_OPS_TABLE,
+        5: UOPS_TABLE,
+        6: DELIMITERS_TABLE,
+    }
+    names = {}
+    for table_num, table in samples.items():
+        for lexeme_num, value in enumerate(table, 1):
+            token = Token(table_num, lexeme_num, 0, 0, value)
+            names[(table_num, lexeme_num)] = (token.get_type_group(), token.get_type())
+    for table_num in (7, 8):
+        token = Token(table_num, 1, 0, 0, "")
+        names[(table_num, None)] = (token.get_type_group(), token.get_type())
+    return names
+
+
+NAMES = _build_names()
+
+
+def _by_table(make):
+    """Таблица по table_num: строка для 7 и 8, кортеж по lexeme_num для 1..6."""
+    tables = [None] * 9
+    for (table_num, lexeme_num), names in NAMES.items():
+        if lexeme_num is None:
+            tables[table_num] = make(*names)
+    for table_num in range(1, 7):
+        size = max(k for n, k in NAMES if n == table_num)
+        tables[table_num] = (None,) + tuple(
+            make(*NAMES[(table_num, k)]) for k in range(1, size + 1)
+        )
+    return tables
+
+
+TEXT_PREFIXES = _by_table(
+    lambda group, type_name: f"GROUP: {group:<12}| TYPE: {type_name:<12}| VALUE: '"
+)
+JSON_NAMES = _by_table(
+    lambda group, type_name: f'"group": {json.dumps(group)}, "type": {json.dumps(type_name)}, '
+)
+EOF_JSON_NAMES = '"group": "EOF", "type": "EOF", '
+_encode_string = json.encoder.encode_basestring
+
+
+def _lookup(tables, token):
+    """Значение из таблицы _by_table для токена или None."""
+    table_num = token.table_num
+    if not 0 < table_num < len(tables):
+        return None
+    entry = tables[table_num]
+    if isinstance(entry, str):
+        return entry
+    lexeme_num = token.lexeme_num
+    return entry[lexeme_num] if 0 < lexeme_num < len(entry) else None
+
+
+def token_names(token):
+    """Группа и тип токена; ("EOF", "EOF") для таблицы 0."""
+    table_num = token.table_num
+    key = (table_num, None) if table_num in (7, 8) else (table_num, token.lexeme_num)
+    return NAMES.get(key, ("EOF", "EOF"))
+
+
+class TokenDumper:
+    """Буферизованная запись токенов в out по мере их поступления."""
+
+    def __init__(self, out, format="text", buffer_tokens=BUFFER_TOKENS):
+        if format not in FORMATS:
+            raise ValueError(f"Unknown dump format: {format}")
+        self.out = out
+        self.format = format
+        self.buffer_tokens = buffer_tokens
+        self._buffer = []
+        self._pending = 0
+        if format == "csv":
+            self._csv = csv.writer(_BufferWriter(self._buffer), lineterminator="\n")
+            self._csv.writerow(CSV_FIELDS)
+        self._format = {
+            "text": self._format_text,
+            "csv": self._format_csv,
+            "jsonl": self._format_jsonl,
+        }[format]
+
+    def write(self, tokens):
+        for start in range(0, len(tokens), self.buffer_tokens):
+            batch = tokens[start : start + self.buffer_tokens]
+            self._format(batch)
+            self._pending += len(batch)
+            if self._pending >= self.buffer_tokens:
+                self.flush()
+
+    def flush(self):
+        if self._buffer:
+            self.out.write("".join(self._buffer))
+            self._buffer.clear()
+        self._pending = 0
+        self.out.flush()
+
+    def _format_text(self, tokens):
+        prefixes = TEXT_PREFIXES
+        append = self._buffer.append
+        for token in tokens:
+            table_num = token.table_num
+            prefix = prefixes[table_num] if 6 < table_num < 9 else _lookup(prefixes, token)
+            if prefix is None:
+                append(EOF_LINE if table_num == 0 else str(token))
+                append("\n")
+            else:
+                append(f"{prefix}{token.value}'\n")
+
+    def _format_csv(self, tokens):
+        self._csv.writerows(
+            (
+                token.table_num,
+                token.lexeme_num,
+                token.line,
+                token.column,
+                *token_names(token),
+                token.value,
+            )
+            for token in tokens
+        )
+
+    def _format_jsonl(self, tokens):
+        # Совпадает с json.dumps(запись, ensure_ascii=False), но без словаря на токен
+        append = self._buffer.append
+        for token in tokens:
+            names = _lookup(JSON_NAMES, token) or EOF_JSON_NAMES
+            value = "null" if token.value is None else _encode_string(token.value)
+            append(
+                f'{{"table_num": {token.table_num}, "lexeme_num": {token.lexeme_num}, '
+                f'"line": {token.line}, "column": {token.column}, {names}"value": {value}}}\n'
+            )
+
+
+class _BufferWriter:
+    """Объект с write() для csv.writer, пишущий в список строк."""
+
+    def __init__(self, buffer):
+        self.write = buffer.append
+
+
+def dump_file(path, out=None, format="text", chunk_size=CHUNK_SIZE):
+    """Потоковый вывод токенов файла: токены пишутся по мере чтения.
+
+    При ошибке лексического анализа выводятся все токены до неё, после
+    чего исключение передаётся дальше.
+    """
+    out = out if out is not None else sys.stdout
+    dumper = TokenDumper(out, format)
+    lexer = StreamLexer()
+    try:
+        with open(path, "rb") as file:
+            while chunk := file.read(chunk_size):
+                dumper.write(lexer.feed(chunk))
+        dumper.write(lexer.close())
+    except Exception:
+        # Вывод полон до места ошибки
+        dumper.write(lexer.take())
+        raise
+    finally:
+        dumper.flush()
+    return dumper
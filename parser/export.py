@@ -0,0 +1,91 @@
+"""Выгрузка потока токенов в структурированные массивы NumPy.
+
+NumPy — необязательная зависимость, импортируется при первом вызове.
+"""
+
+from .lexer import Lexer
+
+TOKEN_FIELDS = [
+    ("table_num", "u1"),
+    ("lexeme_num", "u4"),
+    ("line", "u4"),
+    ("column", "i4"),  # у EOF без завершающего перевода строки бывает < 1
+    ("value", "i4"),  # индекс в таблице значений, -1 если значения нет
+]
+BATCH_TOKEN_FIELDS = [("file_id", "u4")] + TOKEN_FIELDS
+
+
+def _numpy():
+    try:
+        import numpy
+    except ImportError as e:
+        raise ImportError("Token export requires NumPy: pip install numpy") from e
+    return numpy
+
+
+def _rows(tokens, values, file_id=None):
+    """Кортежи полей токенов; значения интернируются в словарь values."""
+    prefix = () if file_id is None else (file_id,)
+    for token in tokens:
+        if token.value is None:
+            value_index = -1
+        else:
+            value_index = values.setdefault(token.value, len(values))
+        yield prefix + (
+            token.table_num,
+            token.lexeme_num,
+            token.line,
+            token.column,
+            value_index,
+        )
+
+
+def tokens_to_array(lexer):
+    """Поток токенов лексера в виде структурированного массива.
+
+    Возвращает пару (массив, таблицы), где таблицы — словарь списков
+    строк "values", "numbers" и "identifiers". Поле value массива
+    индексирует таблицу "values".
+    """
+    np = _numpy()
+    tokens = lexer.tokens or lexer.tokenize()
+    values = {}
+    array = np.fromiter(
+        _rows(tokens, values), dtype=np.dtype(TOKEN_FIELDS), count=len(tokens)
+    )
+    tables = {
+        "values": list(values),
+        "numbers": list(lexer.numbers_table),
+        "identifiers": list(lexer.identifiers_table),
+    }
+    return array, tables
+
+
+def batch_to_array(paths, encoding="UTF-8"):
+    """Токены нескольких файлов в одном массиве с колонкой file_id.
+
+    Таблица "values" общая для всех файлов, "files" содержит пути в
+    порядке file_id. Поле lexeme_num у чисел и идентификаторов остаётся
+    локальным для файла, для сравнения между файлами используйте value.
+    """
+    np = _numpy()
+    lexer = Lexer("")
+    values = {}
+    files = []
+    chunks = []
+    for file_id, path in enumerate(paths):
+        with open(path, "r", encoding=encoding) as file:
+            tokens = lexer.reset(file.read()).tokenize()
+        files.append(str(path))
+        chunks.append(
+            np.fromiter(
+                _rows(tokens, values, file_id),
+                dtype=np.dtype(BATCH_TOKEN_FIELDS),
+                count=len(tokens),
+            )
+        )
+    if chunks:
+        array = np.concatenate(chunks)
+    else:
+        array = np.empty(0, dtype=np.dtype(BATCH_TOKEN_FIELDS))
+    return array, {"values": list(values), "files": files}
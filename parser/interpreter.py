@@ -0,0 +1,291 @@
+"""Выполнение программ и профилирование по строкам исходного текста.
+
+ProgramBuilder разбирает программу грамматикой Parser и собирает из
+вызовов operator_() дерево операторов; выражения строятся DagParser
+и добавляются к текущему оператору через root().
+Executor выполняет дерево, при profile=True считает число выполнений и
+время каждого оператора (по строке исходного текста) и итерации циклов.
+max_steps ограничивает число выполненных операторов и итераций.
+"""
+
+import sys
+import time
+
+from .dag import OPERATIONS, DagParser, parse_number_literal
+from .lexer import Lexer
+from .limits import limit_error
+
+DEFAULT_VALUES = {"integer": 0, "real": 0.0, "boolean": False}
+
+
+class Statement:
+    __slots__ = ("kind", "line", "targets", "expressions", "children")
+
+    def __init__(self, kind, line):
+        self.kind = kind  # assign, if, for, while, compound, read, write
+        self.line = line
+        self.targets = []  # имена переменных: цель присваивания, read()
+        self.expressions = []
+        self.children = []
+
+
+STATEMENT_KINDS = {
+    (1, "if"): "if",
+    (1, "for"): "for",
+    (1, "while"): "while",
+    (1, "read"): "read",
+    (1, "write"): "write",
+    (6, "["): "compound",
+}
+
+
+class ProgramBuilder(DagParser):
+    """Parser, возвращающий список операторов программы и типы переменных."""
+
+    def __init__(self, lexer, dag=None):
+        self.statements = []
+        self.variables = {}
+        self._frames = [self.statements]
+        self._current = None
+        super().__init__(lexer, dag)
+
+    def reset(self, text):
+        self.statements = []
+        self.variables = {}
+        self._frames = [self.statements]
+        self._current = None
+        return super().reset(text)
+
+    def operator_(self):
+        token = self.current_token
+        if token.table_num == 8:
+            kind = "assign"
+        else:
+            kind = STATEMENT_KINDS.get((token.table_num, token.value.lower()))
+        statement = Statement(kind, token.line)
+        parent = self._current
+        self._frames[-1].append(statement)
+        self._frames.append(statement.children)
+        self._current = statement
+        super().operator_()
+        self._frames.pop()
+        self._current = parent
+
+    def root(self, node):
+        super().root(node)
+        self._current.expressions.append(node)
+
+    def reference(self, kind, token):
+        if kind == "declare":
+            type_token = self.symbol_table.lookup(token.value)
+            self.variables[token.value] = type_token.value.lower()
+        elif kind in ("assign", "read"):
+            self._current.targets.append(token.value)
+
+
+class Profile:
+    def __init__(self):
+        self.counts = {}  # строка -> число выполнений операторов
+        self.times = {}  # строка -> суммарное время (с вложенными)
+        self.iterations = {}  # строка цикла -> число итераций
+
+    def record(self, line, elapsed):
+        self.counts[line] = self.counts.get(line, 0) + 1
+        self.times[line] = self.times.get(line, 0.0) + elapsed
+
+    def annotate(self, text_lines, top=10):
+        """Исходный текст с числом выполнений и временем; '>' — горячие строки."""
+        hot = set(sorted(self.times, key=self.times.get, reverse=True)[:top])
+        total = max(self.times.values(), default=0.0) or 1.0
+        result = []
+        for number, text in enumerate(text_lines, 1):
+            if number in self.counts:
+                mark = ">" if number in hot else " "
+                stats = (
+                    f"{self.counts[number]:>10} {self.times[number] * 1000:>10.3f}ms"
+                    f" {self.times[number] / total:>6.1%}"
+                )
+                iterations = self.iterations.get(number)
+                if iterations:
+                    per_iteration = self.times[number] / iterations * 1e6
+                    stats += f" {iterations:>9} it {per_iteration:>9.2f}us/it"
+                else:
+                    stats += " " * 28
+            else:
+                mark = " "
+                stats = " " * 57
+            result.append(f"{mark}{number:>5} |{stats} | {text}")
+        return "\n".join(result)
+
+
+class RuntimeFault(Exception):
+    """Ошибка выполнения программы."""
+
+
+class Executor:
+    def __init__(
+        self,
+        statements,
+        variables,
+        input=None,
+        output=None,
+        profile=False,
+        max_steps=None,
+    ):
+        self.statements = statements
+        self.variables = {
+            name: DEFAULT_VALUES[type_name] for name, type_name in variables.items()
+        }
+        self.types = dict(variables)
+        self.input = iter(input if input is not None else ())
+        self.output = output if output is not None else sys.stdout
+        self.profile = Profile() if profile else None
+        self.max_steps = max_steps if max_steps is not None else sys.maxsize
+        self.steps = 0
+        self._handlers = {
+            "assign": self._assign,
+            "if": self._if,
+            "for": self._for,
+            "while": self._while,
+            "compound": self._compound,
+            "read": self._read,
+            "write": self._write,
+        }
+
+    def run(self):
+        for statement in self.statements:
+            self.execute(statement)
+        return self.variables
+
+    def step(self, line):
+        self.steps += 1
+        if self.steps > self.max_steps:
+            raise limit_error(line, f"step budget of {self.max_steps} exhausted")
+
+    def execute(self, statement):
+        self.step(statement.line)
+        if self.profile is None:
+            self._handlers[statement.kind](statement)
+            return
+        started = time.perf_counter()
+        try:
+            self._handlers[statement.kind](statement)
+        finally:
+            self.profile.record(statement.line, time.perf_counter() - started)
+
+    def iteration(self, statement):
+        self.step(statement.line)
+        if self.profile is not None:
+            iterations = self.profile.iterations
+            iterations[statement.line] = iterations.get(statement.line, 0) + 1
+
+    def evaluate(self, node, line):
+        """Значение выражения; обход в обратном порядке с явным стеком."""
+        constant = node.constant
+        if constant is not None:
+            return constant
+        if node.op == "id":
+            return self.variables[node.value]
+        variables = self.variables
+        values = []
+        stack = [(node, False)]
+        while stack:
+            current, expanded = stack.pop()
+            constant = current.constant
+            if constant is not None:
+                values.append(constant)
+            elif current.op == "id":
+                values.append(variables[current.value])
+            elif not expanded:
+                stack.append((current, True))
+                stack.extend((child, False) for child in reversed(current.children))
+            else:
+                count = len(current.children)
+                operands = values[-count:]
+                del values[-count:]
+                try:
+                    values.append(OPERATIONS[current.op](*operands))
+                except ZeroDivisionError:
+                    raise RuntimeFault(
+                        f"Runtime error at line {line}: division by zero"
+                    ) from None
+        return values[0]
+
+    def _assign(self, statement):
+        self.variables[statement.targets[0]] = self.evaluate(
+            statement.expressions[0], statement.line
+        )
+
+    def _if(self, statement):
+        if self.evaluate(statement.expressions[0], statement.line):
+            self.execute(statement.children[0])
+        elif len(statement.children) > 1:
+            self.execute(statement.children[1])
+
+    def _for(self, statement):
+        name = statement.targets[0]
+        self.variables[name] = self.evaluate(statement.expressions[0], statement.line)
+        limit = self.evaluate(statement.expressions[1], statement.line)
+        body = statement.children[0]
+        while self.variables[name] <= limit:
+            self.iteration(statement)
+            self.execute(body)
+            self.variables[name] += 1
+
+    def _while(self, statement):
+        condition = statement.expressions[0]
+        body = statement.children[0]
+        while self.evaluate(condition, statement.line):
+            self.iteration(statement)
+            self.execute(body)
+
+    def _compound(self, statement):
+        for child in statement.children:
+            self.execute(child)
+
+    def _read(self, statement):
+        for name in statement.targets:
+            try:
+                text = next(self.input)
+            except StopIteration:
+                raise RuntimeFault(
+                    f"Runtime error at line {statement.line}: no input for '{name}'"
+                )
+            self.variables[name] = convert_input(text, self.types[name], statement.line)
+
+    def _write(self, statement):
+        values = [self.evaluate(node, statement.line) for node in statement.expressions]
+        self.output.write(" ".join(format_value(value) for value in values) + "\n")
+
+
+def convert_input(text, type_name, line):
+    if type_name == "boolean" and text.lower() in ("true", "false"):
+        return text.lower() == "true"
+    value = parse_number_literal(text) if type_name != "boolean" else None
+    if value is None:
+        raise RuntimeFault(
+            f"Runtime error at line {line}: invalid {type_name} input '{text}'"
+        )
+    return float(value) if type_name == "real" else value
+
+
+def format_value(value):
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    return str(value)
+
+
+def run_program(text, input=None, output=None, profile=False, max_steps=None):
+    """Разбор и выполнение программы; возвращает Executor после выполнения."""
+    builder = ProgramBuilder(Lexer(text))
+    builder.parse()
+    executor = Executor(
+        builder.statements,
+        builder.variables,
+        input=input,
+        output=output,
+        profile=profile,
+        max_steps=max_steps,
+    )
+    executor.run()
+    return executor
@@ -1,5 +1,83 @@
+from types import MappingProxyType
 from typing import List
 
+from .limits import DEADLINE_CHECK_INTERVAL, NO_LIMITS, check_deadline, limit_error
+
+# Статические лексические таблицы строятся один раз при импорте модуля
+# и разделяются всеми экземплярами Token, Lexer и Parser.
+
+# Конец файла
+EOF_TABLE = ("EOF",)
+
+# Таблица служебных слов (n = 1)
+KEYWORDS_TABLE = (
+    "program",
+    "var",
+    "begin",
+    "end",
+    "if",
+    "else",
+    "while",
+    "for",
+    "to",
+    "then",
+    "do",
+    "read",
+    "write",
+    "true",
+    "false",
+    "integer",
+    "real",
+    "boolean",
+    "as",
+)
+
+# Таблица операторов отношений (n = 2)
+REL_OP_TABLE = ("NE", "EQ", "LT", "LE", "GT", "GE")
+
+# Таблица операций сложения (n = 3)
+ADD_OPS_TABLE = ("plus", "min", "or")
+
+# Таблица операций умножения (n = 4)
+MUL_OPS_TABLE = ("mult", "div", "and")
+
+# Таблица унарных операций (n = 5)
+UOPS_TABLE = ("~",)
+
+# Таблица разделителей (n = 6)
+DELIMITERS_TABLE = ("[", "]", "(", ")", ",", ":", ";", ".", "=", "<", ">")
+DELIMITER_NAMES = MappingProxyType(
+    {
+        "[": "lbracket",
+        "]": "rbracket",
+        "(": "lparen",
+        ")": "rparen",
+        ",": "comma",
+        ":": "colon",
+        ";": "semicolon",
+        ".": "dot",
+        "=": "assign",
+        "<": "lt",
+        ">": "gt",
+    }
+)
+
+
+def _index(table):
+    """Словарь «лексема -> номер в таблице» (нумерация с 1)."""
+    return MappingProxyType({name: i + 1 for i, name in enumerate(table)})
+
+
+KEYWORDS_INDEX = _index(KEYWORDS_TABLE)
+REL_OP_INDEX = _index(REL_OP_TABLE)
+ADD_OPS_INDEX = _index(ADD_OPS_TABLE)
+MUL_OPS_INDEX = _index(MUL_OPS_TABLE)
+UOPS_INDEX = _index(UOPS_TABLE)
+DELIMITERS_INDEX = _index(DELIMITERS_TABLE)
+
+# Символы, с которых может начинаться разделитель или оператор
+OPERATOR_START_CHARS = frozenset(DELIMITERS_TABLE) | frozenset("<>:!=~+-*/a")
+
 class Token:
     def __init__(self, table_num, lexeme_num, line, column, value=None):
         self.table_num = table_num  # n
@@ -9,64 +87,33 @@ class Token:
         self.value = value
 
     # Конец файла
-    EOF_table = ["EOF"]
+    EOF_table = EOF_TABLE
 
     # Таблица служебных слов (n = 1)
-    keywords_table = [
-        "program",
-        "var",
-        "begin",
-        "end",
-        "if",
-        "else",
-        "while",
-        "for",
-        "to",
-        "then",
-        "do",
-        "read",
-        "write",
-        "true",
-        "false",
-        "integer",
-        "real",
-        "boolean",
-        "as",
-    ]
+    keywords_table = KEYWORDS_TABLE
 
     # Таблица операторов отношений (n = 2)
-    rel_op_table = ["NE", "EQ", "LT", "LE", "GT", "GE"]
+    rel_op_table = REL_OP_TABLE
 
     # Таблица операций сложения (n = 3)
-    add_ops_table = ["plus", "min", "or"]
+    add_ops_table = ADD_OPS_TABLE
 
     # Таблица операций умножения (n = 4)
-    mul_ops_table = ["mult", "div", "and"]
+    mul_ops_table = MUL_OPS_TABLE
 
     # Таблица унарных операций (n = 5)
-    uops_table = ["~"]
+    uops_table = UOPS_TABLE
 
     # Таблица разделителей (n = 6)
-    delimiters_table = ["[", "]", "(", ")", ",", ":", ";", ".", "=", "<", ">"]
-    delimiters_dict = {
-        "[": "lbracket",
-        "]": "rbracket",
-        "(": "lparen",
-        ")": "rparen",
-        ",": "comma",
-        ":": "colon",
-        ";": "semicolon",
-        ".": "dot",
-        "=": "assign",
-        "<": "lt",
-        ">": "gt",
-    }
+    delimiters_table = DELIMITERS_TABLE
+    delimiters_dict = DELIMITER_NAMES
+
     # Таблица для чисел (n = 7)
     numbers_table = []
 
     # Таблица для идентификаторов (n = 8)
     identifiers_table = []
-    
+
     tables = [
         EOF_table,
         keywords_table,
@@ -123,52 +170,16 @@ class Token:
 
 
 class Lexer:
-    def __init__(self, text):
-        self.text = text
-        self.pos = 0
-        self.line = 1
-        self.column = 1
-        self.current_char = self.text[self.pos] if self.pos < len(self.text) else None
-        self.tokens = []
-        self.text_lines = self.text.split("\n")
-
-        # Таблица служебных слов (n = 1)
-        self.keywords_table = [
-            "program",
-            "var",
-            "begin",
-            "end",
-            "if",
-            "else",
-            "while",
-            "for",
-            "to",
-            "then",
-            "do",
-            "read",
-            "write",
-            "true",
-            "false",
-            "integer",
-            "real",
-            "boolean",
-            "as",
-        ]
-
-        # Таблица операторов отношений (n = 2)
-        self.rel_op_table = ["NE", "EQ", "LT", "LE", "GT", "GE"]
-
-        # Таблица операций сложения (n = 3)
-        self.add_ops_table = ["plus", "min", "or"]
-
-        # Таблица операций умножения (n = 4)
-        self.mul_ops_table = ["mult", "div", "and"]
-
-        # Таблица унарных операций (n = 5)
-        self.uops_table = ["~"]
-
-        # Таблица разделителей (n = 6)
-        self.delimiters_table = ["[", "]", "(", ")", ",", ":", ";", ".", "=", "<", ">"]
+    # Статические таблицы общие для всех экземпляров (n = 1..6)
+    keywords_table = KEYWORDS_TABLE
+    rel_op_table = REL_OP_TABLE
+    add_ops_table = ADD_OPS_TABLE
+    mul_ops_table = MUL_OPS_TABLE
+    uops_table = UOPS_TABLE
+    delimiters_table = DELIMITERS_TABLE
+
+    def __init__(self, text, limits=None):
+        self.limits = limits or NO_LIMITS
 
         # Таблица для чисел (n = 7)
         self.numbers_table = []
@@ -176,6 +187,46 @@ class Lexer:
         # Таблица для идентификаторов (n = 8)
         self.identifiers_table = []
 
+        # Номера лексем в таблицах 7 и 8 для поиска за O(1)
+        self._number_nums = {}
+        self._identifier_nums = {}
+
+        self.reset(text)
+
+    def reset(self, text):
+        """Подготовка лексера к разбору нового текста.
+
+        Таблицы чисел и идентификаторов очищаются на месте, поэтому один
+        экземпляр можно переиспользовать для множества входных текстов.
+        Список токенов, возвращённый предыдущим tokenize(), не изменяется.
+        """
+        if len(text) > self.limits.max_source_size:
+            raise limit_error(
+                1, f"source size {len(text)} exceeds {self.limits.max_source_size}"
+            )
+        self.deadline = self.limits.deadline()
+        # Число токенов, при достижении которого проверяются ограничения
+        self._token_budget = self._next_token_budget(0)
+        self.text = text
+        self.pos = 0
+        self.line = 1
+        self.column = 1
+        self.current_char = self.text[self.pos] if self.pos < len(self.text) else None
+        self.tokens = []
+        self._text_lines = None
+        self.numbers_table.clear()
+        self.identifiers_table.clear()
+        self._number_nums.clear()
+        self._identifier_nums.clear()
+        return self
+
+    @property
+    def text_lines(self):
+        """Строки исходного текста (нужны только для сообщений об ошибках)."""
+        if self._text_lines is None:
+            self._text_lines = self.text.split("\n")
+        return self._text_lines
+
     def advance(self):
         """Переход к следующему символу."""
         if self.current_char == "\n":
@@ -190,8 +241,56 @@ class Lexer:
         else:
             self.current_char = None
 
+    def skip_to(self, index):
+        """Переход сразу к позиции index с учётом строк и столбцов."""
+        newlines = self.text.count("\n", self.pos, index)
+        if newlines:
+            self.line += newlines
+            self.column = index - self.text.rfind("\n", self.pos, index)
+        else:
+            self.column += index - self.pos
+        self.pos = index
+        self.current_char = self.text[index] if index < len(self.text) else None
+
+    def _next_token_budget(self, count):
+        if self.deadline is None:
+            return self.limits.max_tokens
+        return min(self.limits.max_tokens, count + DEADLINE_CHECK_INTERVAL)
+
+    def _check_token_limits(self):
+        count = len(self.tokens)
+        if count >= self.limits.max_tokens:
+            raise limit_error(
+                self.line, f"token count exceeds {self.limits.max_tokens}"
+            )
+        check_deadline(self.deadline, self.line)
+        self._token_budget = self._next_token_budget(count)
+
+    def add_identifier(self, text):
+        """Номер идентификатора в таблице (n = 8), при необходимости новый."""
+        num = self._identifier_nums.get(text)
+        if num is None:
+            if len(self.identifiers_table) >= self.limits.max_identifiers:
+                raise limit_error(
+                    self.line,
+                    f"distinct identifiers exceed {self.limits.max_identifiers}",
+                )
+            self.identifiers_table.append(text)
+            num = self._identifier_nums[text] = len(self.identifiers_table)
+        return num
+
+    def add_number(self, text):
+        """Номер числа в таблице (n = 7), при необходимости новый."""
+        num = self._number_nums.get(text)
+        if num is None:
+            self.numbers_table.append(text)
+            num = self._number_nums[text] = len(self.numbers_table)
+        return num
+
     def add_token(self, n, k, value=None):
         """Добавление токена в список токенов."""
+        if len(self.tokens) >= self._token_budget:
+            self._check_token_limits()
         self.tokens.append(
             Token(n, k, self.line, self.column - (len(value) if value else 0), value)
         )
@@ -211,26 +310,25 @@ class Lexer:
         text = self.text[start : self.pos]
 
         # Проверяем, является ли текст служебным словом
-        if text.lower() in self.keywords_table:
-            self.add_token(1, self.keywords_table.index(text.lower()) + 1, value=text)
+        lower = text.lower()
+        if lower in KEYWORDS_INDEX:
+            self.add_token(1, KEYWORDS_INDEX[lower], value=text)
         # Проверяем, является ли текст оператором отношений
-        elif text.upper() in self.rel_op_table:
-            self.add_token(2, self.rel_op_table.index(text.upper()) + 1, value=text)
+        elif text.upper() in REL_OP_INDEX:
+            self.add_token(2, REL_OP_INDEX[text.upper()], value=text)
         # Проверяем, является ли текст операцией сложения
-        elif text.lower() in self.add_ops_table:
-            self.add_token(3, self.add_ops_table.index(text.lower()) + 1, value=text)
+        elif lower in ADD_OPS_INDEX:
+            self.add_token(3, ADD_OPS_INDEX[lower], value=text)
         # Проверяем, является ли текст операцией умножения
-        elif text.lower() in self.mul_ops_table:
-            self.add_token(4, self.mul_ops_table.index(text.lower()) + 1, value=text)
+        elif lower in MUL_OPS_INDEX:
+            self.add_token(4, MUL_OPS_INDEX[lower], value=text)
         else:
             # Иначе считаем текст идентификатором
-            if text not in self.identifiers_table:
-                self.identifiers_table.append(text)
-            self.add_token(8, self.identifiers_table.index(text) + 1, value=text)
+            self.add_token(8, self.add_identifier(text), value=text)
 
     def parse_number(self):
         """Разбор числовых литералов, включая поддержку суффиксов."""
-        text = ""
+        start = self.pos
         has_decimal_point = False
         is_float = False
 
@@ -242,19 +340,15 @@ class Lexer:
                     break
                 has_decimal_point = True
                 is_float = True
-            text += self.current_char
             self.advance()
 
         if self.current_char and self.current_char.upper() == 'E':
             is_float = True
-            text += self.current_char
             self.advance()
             if self.current_char in '+-':
-                text += self.current_char
                 self.advance()
             if self.current_char and self.current_char.isdigit():
                 while self.current_char and self.current_char.isdigit():
-                    text += self.current_char
                     self.advance()
             else:
                 is_float = False
@@ -262,28 +356,27 @@ class Lexer:
         suffix = ""
         if self.current_char and self.current_char.lower() in 'bohd':
             suffix = self.current_char.lower()
-            text += self.current_char
             self.advance()
 
         # Если после числа идет буква, и это не суффикс системы счисления, то это идентификатор
         if self.current_char is not None and self.current_char.isalpha() and len(suffix) != 1:
             while self.current_char is not None and self.current_char.isalnum():
-                text += self.current_char
                 self.advance()
-            if text not in self.identifiers_table:
-                self.identifiers_table.append(text)
-            self.add_token(8, self.identifiers_table.index(text) + 1, value=text)
+            text = self.text[start : self.pos]
+            self.add_token(8, self.add_identifier(text), value=text)
             return
-        
-        if text not in self.numbers_table:
-            self.numbers_table.append(text)
-        self.add_token(7, self.numbers_table.index(text) + 1, value=text)
+
+        text = self.text[start : self.pos]
+        self.add_token(7, self.add_number(text), value=text)
 
     def parse_comment(self):
         """Разбор комментариев вида /* ... */."""
         self.advance()  # Пропускаем '/'
         self.advance()  # Пропускаем '*'
         while self.current_char:
+            # Тело комментария пропускается целиком до ближайшей '*'
+            star = self.text.find("*", self.pos)
+            self.skip_to(star if star != -1 else len(self.text))
             if self.current_char == "*":
                 self.advance()
                 if self.current_char == "/":
@@ -293,8 +386,6 @@ class Lexer:
                     raise Exception(
                         f"Syntax error at line {self.line}: An incomplete multi-line comment\n    {self.text_lines[self.line - 1].strip()}"
                     )
-            else:
-                self.advance()
 
     def parse_delimiter_or_operator(self):
         """Разбор разделителей и операторов."""
@@ -314,16 +405,16 @@ class Lexer:
             self.advance()
 
         # Определение типа токена
-        if text.upper() in self.rel_op_table:
-            self.add_token(2, self.rel_op_table.index(text.upper()) + 1, value=text)
-        elif text.lower() in self.add_ops_table:
-            self.add_token(3, self.add_ops_table.index(text.lower()) + 1, value=text)
-        elif text.lower() in self.mul_ops_table:
-            self.add_token(4, self.mul_ops_table.index(text.lower()) + 1, value=text)
-        elif text in self.uops_table:
-            self.add_token(5, self.uops_table.index(text) + 1, value=text)
-        elif text in self.delimiters_table:
-            self.add_token(6, self.delimiters_table.index(text) + 1, value=text)
+        if text.upper() in REL_OP_INDEX:
+            self.add_token(2, REL_OP_INDEX[text.upper()], value=text)
+        elif text.lower() in ADD_OPS_INDEX:
+            self.add_token(3, ADD_OPS_INDEX[text.lower()], value=text)
+        elif text.lower() in MUL_OPS_INDEX:
+            self.add_token(4, MUL_OPS_INDEX[text.lower()], value=text)
+        elif text in UOPS_INDEX:
+            self.add_token(5, UOPS_INDEX[text], value=text)
+        elif text in DELIMITERS_INDEX:
+            self.add_token(6, DELIMITERS_INDEX[text], value=text)
         else:
             self.add_token(0, 0, value=text)  # Неизвестный токен
 
@@ -333,35 +424,26 @@ class Lexer:
             self.skip_whitespace()
             if not self.current_char:
                 break
-
-            if self.current_char == "/" and self.peek() == "*":
-                self.parse_comment()
-            elif self.current_char.isalpha() or self.current_char == "_":
-                self.parse_identifier_or_keyword()
-            elif self.current_char.isdigit():
-                self.parse_number()
-            elif self.current_char in self.delimiters_table or self.current_char in [
-                "<",
-                ">",
-                ":",
-                "!",
-                "=",
-                "~",
-                "+",
-                "-",
-                "*",
-                "/",
-                "a",
-            ]:
-                self.parse_delimiter_or_operator()
-            else:
-                # Неизвестный символ, можно обработать как ошибку или пропустить
-                self.add_token(0, 0, value=self.current_char)
-                self.advance()
+            self.lex_token()
 
         self.add_token(0, 0, "EOF")  # Добавляем токен конца файла
         return self.tokens
 
+    def lex_token(self):
+        """Разбор одной лексемы (или комментария) с текущей позиции."""
+        if self.current_char == "/" and self.peek() == "*":
+            self.parse_comment()
+        elif self.current_char.isalpha() or self.current_char == "_":
+            self.parse_identifier_or_keyword()
+        elif self.current_char.isdigit():
+            self.parse_number()
+        elif self.current_char in OPERATOR_START_CHARS:
+            self.parse_delimiter_or_operator()
+        else:
+            # Неизвестный символ, можно обработать как ошибку или пропустить
+            self.add_token(0, 0, value=self.current_char)
+            self.advance()
+
     def peek(self):
         """Вспомогательный метод для просмотра следующего символа без его извлечения."""
         if self.pos + 1 < len(self.text):
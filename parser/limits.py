@@ -0,0 +1,71 @@
+import sys
+import time
+
+UNLIMITED = sys.maxsize
+
+# Как часто (в токенах) проверяется время выполнения
+DEADLINE_CHECK_INTERVAL = 1024
+
+# Кадров стека Python на один уровень вложенности скобок (самый глубокий
+# случай) и запас под кадры вызывающего кода
+FRAMES_PER_DEPTH = 4
+RESERVED_FRAMES = 200
+
+
+def safe_max_depth():
+    """Вложенность, которую Parser разбирает без RecursionError."""
+    return max(1, (sys.getrecursionlimit() - RESERVED_FRAMES) // FRAMES_PER_DEPTH)
+
+
+class LimitError(Exception):
+    """Превышен один из ограничителей ресурсов Limits."""
+
+
+class Limits:
+    """Ограничения на разбор недоверенного ввода.
+
+    Значение None означает отсутствие ограничения (кроме max_depth, см.
+    ниже). timeout задаётся в секундах и отсчитывается от Lexer.reset()
+    общим бюджетом на лексический и синтаксический анализ одного текста.
+    Ограничения задаются лексеру; Parser использует limits своего лексера.
+
+    max_depth по умолчанию вычисляется из sys.getrecursionlimit() в момент
+    обращения (см. safe_max_depth), так что глубокая вложенность
+    завершается LimitError, а не RecursionError.
+    """
+
+    def __init__(
+        self,
+        max_source_size=None,
+        max_tokens=None,
+        max_identifiers=None,
+        max_depth=None,
+        timeout=None,
+    ):
+        self.max_source_size = UNLIMITED if max_source_size is None else max_source_size
+        self.max_tokens = UNLIMITED if max_tokens is None else max_tokens
+        self.max_identifiers = UNLIMITED if max_identifiers is None else max_identifiers
+        self._max_depth = max_depth
+        self.timeout = timeout
+
+    @property
+    def max_depth(self):
+        return safe_max_depth() if self._max_depth is None else self._max_depth
+
+    def deadline(self):
+        """Момент time.monotonic(), после которого разбор прерывается."""
+        if self.timeout is None:
+            return None
+        return time.monotonic() + self.timeout
+
+
+NO_LIMITS = Limits()
+
+
+def limit_error(line, message):
+    return LimitError(f"Limit exceeded at line {line}: {message}")
+
+
+def check_deadline(deadline, line):
+    if deadline is not None and time.monotonic() > deadline:
+        raise limit_error(line, "time limit exceeded")
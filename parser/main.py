@@ -1,12 +1,110 @@
+import argparse
+import json
+import sys
+
+from .archive import is_archive, validate_archives
+from .dump import FORMATS, dump_file
+from .interpreter import run_program
 from .lexer import Lexer
+from .memory import memory_report
 from .parser import Parser
+from .watch import Watcher
+
+# Режимы, которые работают с одним текстовым файлом, а не с архивом
+SINGLE_FILE_OPTIONS = ("dump", "memory", "run", "profile", "max_steps")
+
+
+def print_result(path, error):
+    print(f"{path}: {error if error else 'yep'}")
+
 
+def main(argv=None):
+    arg_parser = argparse.ArgumentParser(prog="python -m parser.main")
+    arg_parser.add_argument("path", nargs="?", default="example.txt")
+    arg_parser.add_argument(
+        "--watch", metavar="DIR", help="следить за каталогом и проверять изменения"
+    )
+    arg_parser.add_argument(
+        "--pattern",
+        help="маска имён файлов: *.txt для --watch, все члены архива по умолчанию",
+    )
+    arg_parser.add_argument("--workers", type=int, default=None)
+    arg_parser.add_argument("--debounce", type=float, default=0.2)
+    arg_parser.add_argument(
+        "--memory", action="store_true", help="вывести отчёт о потреблении памяти"
+    )
+    arg_parser.add_argument(
+        "--run", action="store_true", help="выполнить программу (ввод из stdin)"
+    )
+    arg_parser.add_argument(
+        "--profile", action="store_true", help="профилировать выполнение по строкам"
+    )
+    arg_parser.add_argument("--max-steps", type=int, default=None)
+    arg_parser.add_argument(
+        "--dump", choices=FORMATS, help="вывести список токенов в заданном формате"
+    )
+    args = arg_parser.parse_args(argv)
 
-def main():
-    path = "example.txt"
-    with open(path, "r", encoding="UTF-8") as file:
+    if args.watch:
+        watcher = Watcher(
+            args.watch,
+            pattern=args.pattern or "*.txt",
+            workers=args.workers,
+            debounce=args.debounce,
+            on_result=print_result,
+        )
+        try:
+            watcher.run()
+        except KeyboardInterrupt:
+            pass
+        return
+
+    if is_archive(args.path):
+        for name in SINGLE_FILE_OPTIONS:
+            if getattr(args, name) not in (None, False):
+                option = "--" + name.replace("_", "-")
+                arg_parser.error(f"{option} is not supported for archives")
+        results, summary = validate_archives(
+            [args.path], workers=args.workers, pattern=args.pattern
+        )
+        for record in results:
+            print_result(f"{record['archive']}:{record['member']}", record["error"])
+        print(
+            f"{summary['members']} members, {summary['failed']} failed, "
+            f"{summary['bytes'] / 1e6:.2f} MB in {summary['seconds']:.2f}s "
+            f"({summary['mb_per_s']:.2f} MB/s)"
+        )
+        return
+
+    if args.dump:
+        try:
+            dump_file(args.path, format=args.dump)
+        except Exception as e:
+            print(e)
+        return
+
+    with open(args.path, "r", encoding="UTF-8") as file:
         text = file.read()
 
+    if args.memory:
+        print(json.dumps(memory_report(text), indent=2, ensure_ascii=False))
+        return
+
+    if args.run or args.profile:
+        try:
+            executor = run_program(
+                text,
+                input=sys.stdin.read().split(),
+                profile=args.profile,
+                max_steps=args.max_steps,
+            )
+        except Exception as e:
+            print(e)
+            return
+        if executor.profile is not None:
+            print(executor.profile.annotate(text.split("\n")), file=sys.stderr)
+        return
+
     try:
         lexer = Lexer(text)
         parser = Parser(lexer)
@@ -0,0 +1,134 @@
+"""Отчёт о потреблении памяти по фазам разбора.
+
+Фазы измеряются через tracemalloc, размеры основных структур
+вычисляются через sys.getsizeof с учётом общих объектов.
+"""
+
+import sys
+import tracemalloc
+
+from .lexer import Lexer
+from .parser import Parser, SymbolTable
+
+TOP_ALLOCATIONS = 5
+SNAPSHOT_FILTERS = [tracemalloc.Filter(False, tracemalloc.__file__)]
+
+
+class MeasuringSymbolTable(SymbolTable):
+    """SymbolTable, запоминающая наибольший размер своих областей видимости."""
+
+    def __init__(self):
+        super().__init__()
+        self.peak_size = 0
+
+    def exit_scope(self):
+        self.peak_size = max(self.peak_size, self.size())
+        super().exit_scope()
+
+    def size(self):
+        seen = set()
+        total = sys.getsizeof(self.symbols) + sys.getsizeof(self.scopes)
+        for scope in self.scopes:
+            total += sys.getsizeof(scope)
+            for name in scope:
+                total += _sizeof(name, seen)
+        return total
+
+
+def _sizeof(obj, seen):
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    return sys.getsizeof(obj)
+
+
+def _strings_size(container, seen):
+    return sys.getsizeof(container) + sum(_sizeof(item, seen) for item in container)
+
+
+def _tokens_size(tokens, seen):
+    total = sys.getsizeof(tokens)
+    for token in tokens:
+        total += _sizeof(token, seen)
+        if token.value is not None:
+            total += _sizeof(token.value, seen)
+    return total
+
+
+def _measure(action):
+    """Выполнение action под tracemalloc: (результат, сведения о фазе)."""
+    tracemalloc.reset_peak()
+    before_current, _ = tracemalloc.get_traced_memory()
+    before = tracemalloc.take_snapshot().filter_traces(SNAPSHOT_FILTERS)
+    result = action()
+    after_current, after_peak = tracemalloc.get_traced_memory()
+    after = tracemalloc.take_snapshot().filter_traces(SNAPSHOT_FILTERS)
+    top = after.compare_to(before, "lineno")[:TOP_ALLOCATIONS]
+    phase = {
+        "retained": after_current - before_current,
+        "peak": after_peak - before_current,
+        "top": [
+            {"location": str(stat.traceback), "size_diff": stat.size_diff}
+            for stat in top
+        ],
+    }
+    return result, phase
+
+
+def memory_report(text):
+    """Распределение памяти при разборе text; возвращает словарь.
+
+    Фаза "tokenize" — создание Parser, которое выполняет лексический
+    анализ; фаза "parse" — Parser.parse(). Ошибка разбора не прерывает
+    отчёт и сохраняется в поле "error".
+    """
+    started = not tracemalloc.is_tracing()
+    if started:
+        tracemalloc.start()
+    try:
+        lexer = Lexer(text)
+        parser, tokenize_phase = _measure(lambda: Parser(lexer))
+        parser.symbol_table = MeasuringSymbolTable()
+        error = None
+
+        def parse():
+            nonlocal error
+            try:
+                parser.parse()
+            except Exception as e:
+                error = str(e)
+
+        _, parse_phase = _measure(parse)
+    finally:
+        if started:
+            tracemalloc.stop()
+
+    seen = set()
+    structures = {
+        "text": _sizeof(lexer.text, seen),
+        # Строки текста создаются только при выводе сообщения об ошибке
+        "text_lines": (
+            _strings_size(lexer._text_lines, seen)
+            if lexer._text_lines is not None
+            else 0
+        ),
+        "numbers_table": _strings_size(lexer.numbers_table, seen),
+        "identifiers_table": _strings_size(lexer.identifiers_table, seen),
+        "tokens": _tokens_size(parser.tokens, seen),
+        "symbol_table": max(
+            parser.symbol_table.peak_size, parser.symbol_table.size()
+        ),
+    }
+    total = sum(structures.values())
+    source_bytes = len(text.encode("UTF-8"))
+    token_count = len(parser.tokens)
+    return {
+        "source_bytes": source_bytes,
+        "tokens": token_count,
+        "error": error,
+        "phases": {"tokenize": tokenize_phase, "parse": parse_phase},
+        "structures": structures,
+        "total": total,
+        "bytes_per_token": structures["tokens"] / token_count if token_count else 0.0,
+        "bytes_per_source_byte": total / source_bytes if source_bytes else 0.0,
+    }
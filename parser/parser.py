@@ -1,8 +1,27 @@
+import sys
+
+from .lexer import (
+    ADD_OPS_INDEX,
+    DELIMITERS_INDEX,
+    KEYWORDS_INDEX,
+    MUL_OPS_INDEX,
+    REL_OP_INDEX,
+    UOPS_INDEX,
+    Lexer,
+)
+from .limits import DEADLINE_CHECK_INTERVAL, check_deadline, limit_error
+
+
 class SymbolTable:
     def __init__(self):
         self.symbols = {}
         self.scopes = []
 
+    def reset(self):
+        """Очистка таблицы для повторного использования."""
+        self.symbols.clear()
+        self.scopes.clear()
+
     def enter_scope(self):
         """Вход в новую область видимости."""
         self.scopes.append({})
@@ -28,35 +47,71 @@ class SymbolTable:
 
 
 class Parser:
+    # Словари для быстрого доступа к номерам лексем по их именам
+    keywords_dict = KEYWORDS_INDEX
+    rel_op_dict = REL_OP_INDEX
+    add_ops_dict = ADD_OPS_INDEX
+    mul_ops_dict = MUL_OPS_INDEX
+    uops_dict = UOPS_INDEX
+    delimiters_dict = DELIMITERS_INDEX
+
     def __init__(self, lexer):
         self.lexer = lexer
-        self.tokens = lexer.tokenize()  # Получаем список токенов сразу
-        self.current_token_index = 0
-        self.current_token = (
-            self.tokens[self.current_token_index] if self.tokens else None
-        )
         self.symbol_table = SymbolTable()
-        self.text_lines = lexer.text.split("\n")
-
-        # Словари для быстрого доступа к номерам лексем по их именам
-        self.keywords_dict = {
-            name: i + 1 for i, name in enumerate(lexer.keywords_table)
-        }
-        self.rel_op_dict = {name: i + 1 for i, name in enumerate(lexer.rel_op_table)}
-        self.add_ops_dict = {name: i + 1 for i, name in enumerate(lexer.add_ops_table)}
-        self.mul_ops_dict = {name: i + 1 for i, name in enumerate(lexer.mul_ops_table)}
-        self.uops_dict = {name: i + 1 for i, name in enumerate(lexer.uops_table)}
-        self.delimiters_dict = {
-            name: i + 1 for i, name in enumerate(lexer.delimiters_table)
-        }
+        self._load_tokens()
+
+    def _load_tokens(self):
+        self.tokens = self.lexer.tokenize()  # Получаем список токенов сразу
+        self.depth = 0  # Текущая вложенность операторов и выражений
+        self.expression_level = 0  # Вложенность expression() в скобках
+        self.current_token_index = 0
+        self.current_token = self.token_at(0)
+
+    def reset(self, text):
+        """Подготовка пары Lexer/Parser к разбору нового текста."""
+        self.lexer.reset(text)
+        self.symbol_table.reset()
+        self._load_tokens()
+        return self
+
+    @property
+    def text_lines(self):
+        return self.lexer.text_lines
+
+    @property
+    def limits(self):
+        """Ограничения разбора задаются лексеру (Lexer(text, limits))."""
+        return self.lexer.limits
 
     def advance(self):
         """Переход к следующему токену."""
         self.current_token_index += 1
-        if self.current_token_index < len(self.tokens):
-            self.current_token = self.tokens[self.current_token_index]
-        else:
-            self.current_token = None
+        if self.current_token_index % DEADLINE_CHECK_INTERVAL == 0:
+            check_deadline(self.lexer.deadline, self.current_token.line)
+        self.current_token = self.token_at(self.current_token_index)
+
+    def token_at(self, index):
+        """Токен по номеру или None за концом потока.
+
+        Список токенов может пополняться во время разбора (см. stream.py),
+        поэтому его длина заранее не запрашивается.
+        """
+        try:
+            return self.tokens[index]
+        except IndexError:
+            return None
+
+    def enter(self):
+        """Учёт вложенности: compound, if, for, while, скобки и '~'."""
+        self.depth += 1
+        if self.depth > self.limits.max_depth:
+            raise limit_error(
+                self.current_token.line,
+                f"nesting depth exceeds {self.limits.max_depth}",
+            )
+
+    def leave(self):
+        self.depth -= 1
 
     def error(self, message, context=None):
         line = self.text_lines[self.current_token.line - 1]
@@ -68,6 +123,26 @@ class Parser:
                 message}\n    {stript_line}"
         )
 
+    def reference(self, kind, token):
+        """Обращение к переменной: declare, assign, read или use.
+
+        По умолчанию ничего не делает; переопределяется в наследниках,
+        которым нужны перекрёстные ссылки (см. xref.py).
+        """
+
+    # Построение выражений: multiplier(), product(), sum() и expression()
+    # возвращают то, что вернули эти методы. По умолчанию узлы не строятся;
+    # наследники (см. dag.py) переопределяют их, не повторяя грамматику.
+
+    def operand(self, token):
+        """Узел для идентификатора, числа или логической константы."""
+
+    def operation(self, token, operands):
+        """Узел для операции token (отношение, +, *, ~) над operands."""
+
+    def root(self, node):
+        """Готовое выражение оператора (не вложенное в скобки)."""
+
     def get_token_name(self, token):
         """Вспомогательная функция для получения имени токена по его типу и значению."""
         if token.table_num == 0:
@@ -215,6 +290,7 @@ class Parser:
             for id_token in ids:
                 if not self.symbol_table.define(id_token.value, type_token):
                     self.error(f"Variable '{id_token.value}' already declared")
+                self.reference("declare", id_token)
             self.eat(6, self.delimiters_dict[";"])
 
     def id_list(self):
@@ -274,6 +350,7 @@ class Parser:
         """
         <оператор> ::= <присваивания> | <условный> | <фиксированного_цикла> | <условного_цикла> | <составной> | <ввода> | <вывода>
         """
+        self.enter()
         if self.current_token.table_num == 8:
             self.assignment()
         elif (
@@ -308,6 +385,7 @@ class Parser:
             self.output_op()
         else:
             self.error("Expected operator")
+        self.leave()
 
     def assignment(self):
         """
@@ -317,6 +395,7 @@ class Parser:
         self.eat(8, self.current_token.lexeme_num)
         if not self.symbol_table.lookup(id_token.value):
             self.error(f"Variable '{id_token.value}' not declared")
+        self.reference("assign", id_token)
         self.eat(1, self.keywords_dict["as"])
         self.expression()
 
@@ -394,6 +473,7 @@ class Parser:
         self.eat(8, self.current_token.lexeme_num)
         if not self.symbol_table.lookup(id_token.value):
             self.error(f"Variable '{id_token.value}' not declared")
+        self.reference("read", id_token)
         while (
             self.current_token.table_num == 6
             and self.current_token.lexeme_num == self.delimiters_dict[","]
@@ -403,6 +483,7 @@ class Parser:
             self.eat(8, self.current_token.lexeme_num)
             if not self.symbol_table.lookup(id_token.value):
                 self.error(f"Variable '{id_token.value}' not declared")
+            self.reference("read", id_token)
         self.eat(6, self.delimiters_dict[")"])
 
     def output_op(self):
@@ -424,8 +505,10 @@ class Parser:
         """
         <выражение> ::= <сумма> | <выражение> (<>|=|<|<=|>|>=) <сумма>
         """
-        self.sum()
+        self.expression_level += 1
+        node = self.sum()
         while self.current_token.table_num == 2:
+            op_token = self.current_token
             if self.current_token.lexeme_num == self.rel_op_dict["NE"]:
                 self.eat(2, self.rel_op_dict["NE"])
             elif self.current_token.lexeme_num == self.rel_op_dict["EQ"]:
@@ -440,14 +523,19 @@ class Parser:
                 self.eat(2, self.rel_op_dict["GE"])
             else:
                 break
-            self.sum()
+            node = self.operation(op_token, (node, self.sum()))
+        self.expression_level -= 1
+        if not self.expression_level:
+            self.root(node)
+        return node
 
     def sum(self):
         """
         <сумма> ::= <произведение> { (+ | - | or) <произведение>}
         """
-        self.product()
+        node = self.product()
         while self.current_token.table_num == 3:
+            op_token = self.current_token
             if self.current_token.lexeme_num == self.add_ops_dict["plus"]:
                 self.eat(3, self.add_ops_dict["plus"])
             elif self.current_token.lexeme_num == self.add_ops_dict["min"]:
@@ -456,14 +544,16 @@ class Parser:
                 self.eat(3, self.add_ops_dict["or"])
             else:
                 break
-            self.product()
+            node = self.operation(op_token, (node, self.product()))
+        return node
 
     def product(self):
         """
         <произведение> ::= <множитель> { (* | / | and) <множитель>}
         """
-        self.multiplier()
+        node = self.multiplier()
         while self.current_token.table_num == 4:
+            op_token = self.current_token
             if self.current_token.lexeme_num == self.mul_ops_dict["mult"]:
                 self.eat(4, self.mul_ops_dict["mult"])
             elif self.current_token.lexeme_num == self.mul_ops_dict["div"]:
@@ -472,37 +562,49 @@ class Parser:
                 self.eat(4, self.mul_ops_dict["and"])
             else:
                 break
-            self.multiplier()
+            node = self.operation(op_token, (node, self.multiplier()))
+        return node
 
     def multiplier(self):
         """
         <множитель> ::= <идентификатор> | <число> | <логическая_константа> | not <множитель> | «(»<выражение>«)»
         """
+        token = self.current_token
         if self.current_token.table_num == 8:
             id_token = self.current_token
             self.eat(8, self.current_token.lexeme_num)
             if not self.symbol_table.lookup(id_token.value):
                 self.error(f"Variable '{id_token.value}' not declared")
+            self.reference("use", id_token)
+            return self.operand(id_token)
         elif self.current_token.table_num == 7:
             self.number()
+            return self.operand(token)
         elif self.current_token.table_num == 1 and (
             self.current_token.lexeme_num == self.keywords_dict["true"]
             or self.current_token.lexeme_num == self.keywords_dict["false"]
         ):
             self.logical_constant()
+            return self.operand(token)
         elif (
             self.current_token.table_num == 5
             and self.current_token.lexeme_num == self.uops_dict["~"]
         ):
             self.eat(5, self.uops_dict["~"])
-            self.multiplier()
+            self.enter()
+            node = self.multiplier()
+            self.leave()
+            return self.operation(token, (node,))
         elif (
             self.current_token.table_num == 6
             and self.current_token.lexeme_num == self.delimiters_dict["("]
         ):
             self.eat(6, self.delimiters_dict["("])
-            self.expression()
+            self.enter()
+            node = self.expression()
+            self.leave()
             self.eat(6, self.delimiters_dict[")"])
+            return node
         else:
             self.error("Expected identifier, number, logical constant, 'not', or '('")
 
@@ -593,8 +695,36 @@ class Parser:
 
     def parse(self):
         """Запуск синтаксического анализа."""
-        self.program()
+        try:
+            self.program()
+        except RecursionError:
+            # max_depth выше, чем позволяет стек Python
+            raise limit_error(
+                self.current_token.line,
+                f"nesting depth exceeds Python recursion limit {sys.getrecursionlimit()}",
+            ) from None
         if not (
             self.current_token.table_num == 0 and self.current_token.lexeme_num == 0
         ):
             self.error("Expected end of program")
+
+
+_pooled_parser = None
+
+
+def validate_text(text):
+    """Проверка текста программы; None при успехе, иначе сообщение об ошибке.
+
+    Пара Lexer/Parser создаётся один раз на процесс и переиспользуется
+    через reset(), поэтому функция подходит для воркеров пулов процессов.
+    """
+    global _pooled_parser
+    try:
+        if _pooled_parser is None:
+            _pooled_parser = Parser(Lexer(text))
+        else:
+            _pooled_parser.reset(text)
+        _pooled_parser.parse()
+    except Exception as e:
+        return str(e)
+    return None
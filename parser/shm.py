@@ -0,0 +1,303 @@
+"""Передача потока токенов между процессами через разделяемую память.
+
+Лексические воркеры записывают токены, таблицу значений и исходный
+текст в сегмент multiprocessing.shared_memory; воркеры синтаксического
+анализа подключаются к сегменту и читают его без копирования: Parser
+получает последовательность, создающую Token только при обращении.
+
+Формат сегмента (little-endian):
+    заголовок   magic, n_tokens, n_values, values_size, text_size
+    токены      n_tokens * (table_num, lexeme_num, line, column, value)
+                по int32; value — индекс в таблице значений или -1
+    смещения    (n_values + 1) * uint32 в блоке значений
+    значения    UTF-8
+    текст       UTF-8
+"""
+
+import os
+import struct
+import uuid
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from multiprocessing import resource_tracker, shared_memory
+
+from .lexer import Lexer, Token
+from .limits import NO_LIMITS
+from .parser import Parser
+
+MAGIC = b"LXTK"
+HEADER = struct.Struct("<4sIIII")
+TOKEN_FIELDS = 5
+TOKEN_SIZE = TOKEN_FIELDS * 4
+
+
+def segment_prefix():
+    """Уникальный префикс имён сегментов одного конвейера."""
+    return f"lxtk_{os.getpid()}_{uuid.uuid4().hex[:8]}"
+
+
+def _untrack(shm):
+    """Снятие сегмента с учёта resource_tracker текущего процесса.
+
+    SharedMemory регистрирует сегмент и при создании, и при подключении.
+    Трекер процесса, который передал сегмент другому и завершился без
+    unlink(), удалил бы чужой сегмент и сообщил бы об «утечке».
+    """
+    resource_tracker.unregister(shm._name, "shared_memory")
+
+
+def write_segment(lexer, name=None):
+    """Разбор текста лексером и запись результата в новый сегмент.
+
+    Возвращает имя сегмента. Сегмент остаётся в системе после закрытия и
+    не учитывается resource_tracker этого процесса; удалить его должен
+    получатель (см. AttachedLexer.close(unlink=True)).
+    """
+    tokens = lexer.tokens or lexer.tokenize()
+    values = {}
+    fields = []
+    for token in tokens:
+        if token.value is None:
+            value_index = -1
+        else:
+            value_index = values.setdefault(token.value, len(values))
+        fields += (
+            token.table_num,
+            token.lexeme_num,
+            token.line,
+            token.column,
+            value_index,
+        )
+
+    encoded = [value.encode("UTF-8") for value in values]
+    offsets = [0]
+    for value in encoded:
+        offsets.append(offsets[-1] + len(value))
+    text = lexer.text.encode("UTF-8")
+
+    token_bytes = struct.pack(f"<{len(fields)}i", *fields)
+    offset_bytes = struct.pack(f"<{len(offsets)}I", *offsets)
+    header = HEADER.pack(MAGIC, len(tokens), len(values), offsets[-1], len(text))
+    payload = [header, token_bytes, offset_bytes, *encoded, text]
+    size = sum(len(part) for part in payload)
+
+    shm = shared_memory.SharedMemory(name=name, create=True, size=max(size, 1))
+    try:
+        position = 0
+        for part in payload:
+            shm.buf[position : position + len(part)] = part
+            position += len(part)
+    except BaseException:
+        shm.close()
+        shm.unlink()
+        raise
+    name = shm.name
+    _untrack(shm)
+    shm.close()
+    return name
+
+
+class SharedTokens:
+    """Последовательность токенов поверх сегмента, Token создаётся при обращении."""
+
+    def __init__(self, ints, values):
+        self._ints = ints
+        self._values = values
+        self._length = len(ints) // TOKEN_FIELDS
+
+    def __len__(self):
+        return self._length
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError("token index out of range")
+        base = index * TOKEN_FIELDS
+        ints = self._ints
+        value_index = ints[base + 4]
+        return Token(
+            ints[base],
+            ints[base + 1],
+            ints[base + 2],
+            ints[base + 3],
+            None if value_index < 0 else self._values[value_index],
+        )
+
+    def __iter__(self):
+        for index in range(self._length):
+            yield self[index]
+
+
+class SharedValues:
+    """Таблица значений сегмента с ленивым декодированием строк."""
+
+    def __init__(self, offsets, blob):
+        self._offsets = offsets
+        self._blob = blob
+        self._cache = {}
+
+    def __len__(self):
+        return len(self._offsets) - 1
+
+    def __getitem__(self, index):
+        value = self._cache.get(index)
+        if value is None:
+            start, end = self._offsets[index], self._offsets[index + 1]
+            value = self._cache[index] = str(self._blob[start:end], "UTF-8")
+        return value
+
+
+class AttachedLexer(Lexer):
+    """Лексер, отдающий Parser уже готовые токены из сегмента."""
+
+    def __init__(self, name, limits=None):
+        self.limits = limits or NO_LIMITS
+        self.shm = None
+        self.reset(name)
+
+    def reset(self, name):
+        if self.shm is not None:
+            self.close()
+        self.shm = shared_memory.SharedMemory(name=name)
+        self._buf = self.shm.buf.toreadonly()
+        magic, n_tokens, n_values, values_size, text_size = HEADER.unpack_from(self._buf)
+        if magic != MAGIC:
+            self._buf.release()
+            _untrack(self.shm)
+            self.shm.close()
+            self.shm = None
+            raise ValueError(f"Shared memory segment '{name}' does not hold tokens")
+
+        start = HEADER.size
+        end = start + n_tokens * TOKEN_SIZE
+        self._ints = self._buf[start:end].cast("i")
+        start, end = end, end + (n_values + 1) * 4
+        self._offsets = self._buf[start:end].cast("I")
+        start, end = end, end + values_size
+        self._values_blob = self._buf[start:end]
+        self._text_blob = self._buf[end : end + text_size]
+
+        self.values = SharedValues(self._offsets, self._values_blob)
+        self.tokens = SharedTokens(self._ints, self.values)
+        self.deadline = self.limits.deadline()
+        self._text_lines = None
+        return self
+
+    @property
+    def text(self):
+        return str(self._text_blob, "UTF-8")
+
+    def tokenize(self):
+        return self.tokens
+
+    def close(self, unlink=False):
+        """Отключение от сегмента; unlink=True удаляет его из системы."""
+        for view in (
+            self._text_blob,
+            self._values_blob,
+            self._offsets,
+            self._ints,
+            self._buf,
+        ):
+            view.release()
+        self.shm.close()
+        if unlink:
+            self.shm.unlink()
+        else:
+            _untrack(self.shm)
+        self.shm = None
+
+
+def unlink_segment(name):
+    """Удаление сегмента по имени; отсутствующий сегмент не ошибка."""
+    try:
+        shm = shared_memory.SharedMemory(name=name)
+    except FileNotFoundError:
+        return False
+    shm.close()
+    shm.unlink()
+    return True
+
+
+def cleanup_segments(prefix):
+    """Удаление оставшихся сегментов с префиксом (после сбоя воркера)."""
+    removed = 0
+    if os.path.isdir("/dev/shm"):
+        for entry in os.listdir("/dev/shm"):
+            if entry.startswith(prefix) and unlink_segment(entry):
+                removed += 1
+    return removed
+
+
+def validate(parser):
+    """Анализ по умолчанию: None при успехе, иначе сообщение об ошибке."""
+    try:
+        parser.parse()
+    except Exception as e:
+        return str(e)
+    return None
+
+
+def lex_to_segment(path, name, encoding="UTF-8"):
+    with open(path, "r", encoding=encoding) as file:
+        return write_segment(Lexer(file.read()), name)
+
+
+def analyze_segment(name, analyze=validate):
+    """Подключение к сегменту, анализ и его удаление (получатель — владелец)."""
+    lexer = AttachedLexer(name)
+    try:
+        return analyze(Parser(lexer))
+    finally:
+        lexer.close(unlink=True)
+
+
+class SharedPipeline:
+    """Конвейер: лексический анализ и синтаксический анализ в разных пулах.
+
+    Сегмент создаётся лексическим воркером, передаётся по имени воркеру
+    анализа, который удаляет его после работы. Сегменты, оставшиеся после
+    сбоя любой из сторон, удаляются при выходе из run().
+    """
+
+    def __init__(self, lex_workers=None, parse_workers=None, analyze=validate):
+        self.lex_workers = lex_workers
+        self.parse_workers = parse_workers
+        self.analyze = analyze
+
+    def run(self, paths):
+        """Результаты analyze по путям; ошибка воркера становится результатом."""
+        prefix = segment_prefix()
+        results = {}
+        try:
+            with ProcessPoolExecutor(self.lex_workers) as lex_pool, ProcessPoolExecutor(
+                self.parse_workers
+            ) as parse_pool:
+                lexing = {
+                    lex_pool.submit(lex_to_segment, path, f"{prefix}_{i}"): path
+                    for i, path in enumerate(paths)
+                }
+                parsing = {}
+                while lexing or parsing:
+                    done, _ = wait([*lexing, *parsing], return_when=FIRST_COMPLETED)
+                    for future in done:
+                        if future in lexing:
+                            path = lexing.pop(future)
+                            try:
+                                name = future.result()
+                            except Exception as e:
+                                results[path] = str(e)
+                                continue
+                            analysis = parse_pool.submit(
+                                analyze_segment, name, self.analyze
+                            )
+                            parsing[analysis] = path
+                        else:
+                            path = parsing.pop(future)
+                            try:
+                                results[path] = future.result()
+                            except Exception as e:
+                                results[path] = str(e)
+        finally:
+            cleanup_segments(prefix)
+        return results
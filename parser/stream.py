@@ -0,0 +1,236 @@
+"""Потоковый лексический анализ текста, поступающего частями.
+
+StreamLexer принимает куски байтов или строк через feed() и сразу
+возвращает лексемы, которые уже не могут измениться от продолжения
+текста. Лексема, за которой в буфере ещё нет пробельного символа,
+откладывается до следующего куска; комментарий — до первой '*' после
+'/*' и следующего за ней символа. Разобранная часть буфера отбрасывается.
+Сообщение об ошибке содержит строку текста только в полученном объёме.
+
+Для asyncio предусмотрены lex_stream() и validate_stream(); последняя
+выполняет Parser в отдельном потоке параллельно с чтением данных.
+"""
+
+import asyncio
+import codecs
+import re
+import threading
+
+from .lexer import Lexer
+from .limits import limit_error
+from .parser import Parser
+
+# Последний пробельный символ куска текста
+_LAST_SPACE = re.compile(r"\s\S*\Z")
+
+DEFAULT_CHUNK_SIZE = 64 * 1024
+DEFAULT_MAX_PENDING = 64 * 1024
+
+
+class TokenStream(list):
+    """Список токенов, который Parser может читать до его завершения.
+
+    Обращение к ещё не полученному токену блокирует читающий поток,
+    пока лексер не опубликует новые токены или не закроет поток.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._ready = threading.Condition()
+        self.closed = False
+        self.consumer_done = False
+        self.consumed = 0
+
+    def __getitem__(self, index):
+        if isinstance(index, int) and index >= 0:
+            self.consumed = index
+            if index >= len(self):
+                with self._ready:
+                    while index >= len(self) and not self.closed:
+                        self._ready.wait()
+        return super().__getitem__(index)
+
+    def publish(self, closed=False):
+        """Пробуждение читателя после добавления токенов."""
+        with self._ready:
+            self.closed = self.closed or closed
+            self._ready.notify_all()
+
+    def finish(self):
+        """Отметка читателя о завершении разбора."""
+        with self._ready:
+            self.consumer_done = True
+            self._ready.notify_all()
+
+    def wait_room(self, max_pending):
+        """Ожидание, пока читатель не отстанет не более чем на max_pending."""
+        with self._ready:
+            while not self.consumer_done and len(self) - self.consumed > max_pending:
+                self._ready.wait(0.005)
+
+
+class StreamLexer(Lexer):
+    def __init__(self, limits=None, errors="strict"):
+        self._lock = threading.Lock()
+        self.errors = errors  # обработка ошибок декодирования UTF-8
+        super().__init__("", limits)
+
+    def reset(self, text=""):
+        super().reset("")
+        self.tokens = TokenStream()
+        self._decoder = codecs.getincrementaldecoder("UTF-8")(self.errors)
+        self._lines = []  # завершённые строки отброшенной части текста
+        self._partial = []  # начало текущей строки из отброшенной части
+        self._safe_end = -1  # позиция последнего пробельного символа буфера
+        self._received = 0
+        self._emitted = 0
+        if text:
+            self.feed(text)
+        return self
+
+    @property
+    def text_lines(self):
+        with self._lock:
+            return self._lines + ("".join(self._partial) + self.text).split("\n")
+
+    def feed(self, chunk):
+        """Добавление куска текста; возвращает новые завершённые токены."""
+        if isinstance(chunk, (bytes, bytearray, memoryview)):
+            chunk = self._decoder.decode(chunk)
+        try:
+            self._append(chunk)
+            self._drain(final=False)
+            self._discard_consumed()
+        finally:
+            self.tokens.publish()
+        return self.take()
+
+    def close(self):
+        """Конец текста: разбор остатка и токен EOF."""
+        try:
+            self._append(self._decoder.decode(b"", final=True))
+            self._drain(final=True)
+            self.add_token(0, 0, "EOF")
+        finally:
+            self.tokens.publish(closed=True)
+        return self.take()
+
+    def abort(self):
+        """Закрытие потока токенов без EOF (например, при ошибке чтения)."""
+        self.tokens.publish(closed=True)
+
+    def tokenize(self):
+        return self.tokens
+
+    def _append(self, chunk):
+        if not chunk:
+            return
+        self._received += len(chunk)
+        if self._received > self.limits.max_source_size:
+            raise limit_error(
+                self.line, f"source size exceeds {self.limits.max_source_size}"
+            )
+        offset = len(self.text)
+        self.text += chunk
+        match = _LAST_SPACE.search(chunk)
+        if match:
+            self._safe_end = offset + match.start()
+        if self.current_char is None:
+            self.current_char = self.text[self.pos]
+
+    def _is_complete(self):
+        """Можно ли разобрать лексему с текущей позиции без продолжения текста."""
+        if self.text.startswith("/*", self.pos):
+            star = self.text.find("*", self.pos + 2)
+            return star != -1 and star + 1 < len(self.text)
+        return self.pos < self._safe_end
+
+    def _drain(self, final):
+        while True:
+            self.skip_whitespace()
+            if self.current_char is None:
+                return
+            if not final and not self._is_complete():
+                return
+            self.lex_token()
+
+    def _discard_consumed(self):
+        cut = self.pos
+        if not cut:
+            return
+        with self._lock:
+            parts = self.text[:cut].split("\n")
+            self._partial.append(parts[0])
+            if len(parts) > 1:
+                self._lines.append("".join(self._partial))
+                self._lines.extend(parts[1:-1])
+                self._partial = [parts[-1]]
+            self.text = self.text[cut:]
+            self.pos = 0
+            self._safe_end -= cut
+
+    def take(self):
+        """Токены, ещё не возвращённые feed() или close().
+
+        После ошибки в feed() возвращает токены, разобранные до неё.
+        """
+        tokens = self.tokens[self._emitted :]
+        self._emitted += len(tokens)
+        return tokens
+
+
+async def lex_stream(reader, limits=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Асинхронный генератор токенов из asyncio.StreamReader.
+
+    Следующий кусок читается только после того, как потребитель забрал
+    все токены предыдущего, что и ограничивает скорость чтения.
+    """
+    lexer = StreamLexer(limits)
+    while chunk := await reader.read(chunk_size):
+        for token in lexer.feed(chunk):
+            yield token
+    for token in lexer.close():
+        yield token
+
+
+def _parse(lexer):
+    try:
+        Parser(lexer).parse()
+    except Exception as e:
+        return str(e)
+    finally:
+        lexer.tokens.finish()
+    return None
+
+
+async def validate_stream(
+    reader,
+    limits=None,
+    chunk_size=DEFAULT_CHUNK_SIZE,
+    max_pending=DEFAULT_MAX_PENDING,
+):
+    """Проверка программы из asyncio.StreamReader по мере её получения.
+
+    Возвращает None при успехе или текст ошибки. Если Parser отстаёт
+    больше чем на max_pending токенов, чтение приостанавливается.
+    Первая найденная ошибка прекращает чтение. При отмене корутины
+    поток токенов закрывается, и поток разбора завершается.
+    """
+    lexer = StreamLexer(limits)
+    parsing = asyncio.ensure_future(asyncio.to_thread(_parse, lexer))
+    try:
+        while not parsing.done() and (chunk := await reader.read(chunk_size)):
+            lexer.feed(chunk)
+            if len(lexer.tokens) - lexer.tokens.consumed > max_pending:
+                await asyncio.to_thread(lexer.tokens.wait_room, max_pending)
+        if not parsing.done():
+            lexer.close()
+    except Exception as e:
+        lexer.abort()
+        await parsing
+        return str(e)
+    except BaseException:
+        # Отмена или таймаут: поток разбора не должен остаться ждать токенов
+        lexer.abort()
+        raise
+    return await parsing
@@ -0,0 +1,93 @@
+"""Проверка роста времени разбора на неблагоприятных входных данных.
+
+Для каждого сценария текст строится для размеров n, 2n, 4n, 8n и
+измеряется время Lexer + Parser. По наклону в логарифмических
+координатах оценивается степень роста; при наклоне выше MAX_SLOPE
+сценарий считается сверхлинейным, а main() возвращает код 1.
+
+    python -m parser.stress
+
+Те же сценарии запускаются pytest в tests/test_stress.py вместе с
+проверкой, что очень глубокая вложенность отклоняется LimitError.
+"""
+
+import math
+import sys
+import time
+
+from .lexer import Lexer
+from .parser import Parser
+
+MAX_SLOPE = 1.35
+SCALES = (1, 2, 4, 8)
+REPEAT = 3
+
+
+def many_identifiers(n):
+    names = ", ".join(f"v{i}" for i in range(n))
+    return f"program var {names}: integer; begin v0 as 1 end."
+
+
+def long_literal(n):
+    return f"program var x: integer; begin x as {'7' * n} end."
+
+
+def long_comment(n):
+    return f"/* {'comment ' * n} */ program var x: integer; begin x as 1 end."
+
+
+def deep_nesting(n):
+    return f"program var x: integer; begin {'[' * n}x as {'(' * n}1{')' * n}{']' * n} end."
+
+
+def long_statement_list(n):
+    statements = ";\n".join(["x as x plus 1"] * n)
+    return f"program var x: integer; begin {statements} end."
+
+
+def long_line(n):
+    return f"program var x: integer; begin write({' plus '.join(['x'] * n)}) end."
+
+
+# Сценарий -> начальный размер n
+SCENARIOS = {
+    many_identifiers: 2000,
+    long_literal: 20000,
+    long_comment: 200000,
+    # 2 * 8n уровней не должны превышать Limits.max_depth по умолчанию
+    deep_nesting: 12,
+    long_statement_list: 1000,
+    long_line: 2000,
+}
+
+
+def measure(text, repeat=REPEAT):
+    """Наименьшее время полного разбора text из repeat запусков."""
+    best = math.inf
+    for _ in range(repeat):
+        started = time.perf_counter()
+        Parser(Lexer(text)).parse()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def growth(scenario, base):
+    """Времена для размеров base * SCALES и оценка степени роста."""
+    times = [measure(scenario(base * scale)) for scale in SCALES]
+    slope = math.log(times[-1] / times[0]) / math.log(SCALES[-1] / SCALES[0])
+    return times, slope
+
+
+def main():
+    failed = False
+    for scenario, base in SCENARIOS.items():
+        times, slope = growth(scenario, base)
+        verdict = "ok" if slope <= MAX_SLOPE else "SUPER-LINEAR"
+        failed |= slope > MAX_SLOPE
+        timings = " ".join(f"{t * 1000:8.2f}" for t in times)
+        print(f"{scenario.__name__:<20}| {timings} ms | slope {slope:4.2f} | {verdict}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,257 @@
+"""Режим наблюдения: повторная проверка изменившихся файлов в каталоге.
+
+Изменения отслеживаются через inotify (Linux, через ctypes), при его
+отсутствии — периодическим опросом. Серии записей объединяются
+(debounce), проверка выполняется пулом процессов. Файл передаётся в
+лексер только если изменилось его содержимое (SHA-256).
+"""
+
+import ctypes
+import ctypes.util
+import fnmatch
+import hashlib
+import os
+import select
+import struct
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from .parser import validate_text
+
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+WATCH_MASK = (
+    IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+)
+EVENT_HEADER = struct.Struct("iIII")
+
+def walk_files(root, pattern):
+    for directory, _, names in os.walk(root):
+        for name in fnmatch.filter(names, pattern):
+            yield os.path.join(directory, name)
+
+
+def fingerprint(path):
+    stat = os.stat(path)
+    return stat.st_mtime_ns, stat.st_size
+
+
+class PollingSource:
+    """Источник изменений на основе периодического обхода каталога."""
+
+    def __init__(self, root, pattern, interval=0.5):
+        self.root = root
+        self.pattern = pattern
+        self.interval = interval
+        self.fingerprints = self._scan()
+
+    def _scan(self):
+        result = {}
+        for path in walk_files(self.root, self.pattern):
+            try:
+                result[path] = fingerprint(path)
+            except FileNotFoundError:
+                pass
+        return result
+
+    def wait(self, timeout):
+        """Множество изменившихся путей (возможно пустое) за время timeout."""
+        time.sleep(min(timeout, self.interval))
+        current = self._scan()
+        changed = {
+            path
+            for path in current.keys() | self.fingerprints.keys()
+            if current.get(path) != self.fingerprints.get(path)
+        }
+        self.fingerprints = current
+        return changed
+
+    def close(self):
+        pass
+
+
+class InotifySource:
+    """Источник изменений на основе inotify; None из wait() — нужен полный обход."""
+
+    def __init__(self, root, pattern):
+        self.root = root
+        self.pattern = pattern
+        self._libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        self.fd = self._libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self.directories = {}
+        for directory, _, _ in os.walk(root):
+            self._add_watch(directory)
+
+    def _add_watch(self, directory):
+        wd = self._libc.inotify_add_watch(self.fd, os.fsencode(directory), WATCH_MASK)
+        if wd >= 0:
+            self.directories[wd] = directory
+
+    def _remove_watches(self, path):
+        """Снятие наблюдения с каталога path и всех его подкаталогов."""
+        prefix = os.path.join(path, "")
+        for wd, directory in list(self.directories.items()):
+            if directory == path or directory.startswith(prefix):
+                self._libc.inotify_rm_watch(self.fd, wd)
+                del self.directories[wd]
+
+    def wait(self, timeout):
+        readable, _, _ = select.select([self.fd], [], [], timeout)
+        if not readable:
+            return set()
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return set()
+
+        changed = set()
+        rescan = False
+        offset = 0
+        while offset < len(data):
+            wd, mask, _, length = EVENT_HEADER.unpack_from(data, offset)
+            offset += EVENT_HEADER.size
+            name = os.fsdecode(data[offset : offset + length].rstrip(b"\0"))
+            offset += length
+            if mask & IN_Q_OVERFLOW:
+                rescan = True
+                continue
+            if mask & IN_IGNORED:
+                # Наблюдение снято ядром (каталог удалён)
+                self.directories.pop(wd, None)
+                continue
+            directory = self.directories.get(wd)
+            if directory is None or not name:
+                continue
+            path = os.path.join(directory, name)
+            if mask & IN_ISDIR:
+                if mask & (IN_CREATE | IN_MOVED_TO):
+                    # Новый подкаталог: следим за ним и проверяем его файлы
+                    for subdirectory, _, _ in os.walk(path):
+                        self._add_watch(subdirectory)
+                    changed.update(walk_files(path, self.pattern))
+                elif mask & (IN_MOVED_FROM | IN_DELETE):
+                    # Подкаталог удалён или перемещён за пределы дерева: его
+                    # файлов больше нет, а их список есть только у Watcher
+                    self._remove_watches(path)
+                    rescan = True
+            elif fnmatch.fnmatch(name, self.pattern):
+                changed.add(path)
+        # Остальные события пакета всё равно обработаны: новые каталоги
+        # получили наблюдение, удалённые — сняты
+        return None if rescan else changed
+
+    def close(self):
+        os.close(self.fd)
+
+
+def collect_changes(source, timeout, debounce):
+    """Изменения за timeout, дополненные до затишья на debounce секунд.
+
+    Возвращает множество путей (пустое, если изменений не было) или None,
+    если источник требует полного обхода каталога.
+    """
+    pending = source.wait(timeout)
+    if not pending:
+        return pending
+    # Источник может вернуться раньше (опрос — через interval), поэтому
+    # затишье отсчитывается по часам, а не по числу пустых ответов
+    quiet_until = time.monotonic() + debounce
+    while (remaining := quiet_until - time.monotonic()) > 0:
+        more = source.wait(remaining)
+        if more is None:
+            return None
+        if more:
+            pending |= more
+            quiet_until = time.monotonic() + debounce
+    return pending
+
+
+def make_source(root, pattern, poll_interval=0.5):
+    try:
+        return InotifySource(root, pattern)
+    except (OSError, AttributeError, TypeError):
+        return PollingSource(root, pattern, poll_interval)
+
+
+class Watcher:
+    """Хранит последние результаты проверки каждого файла каталога."""
+
+    def __init__(
+        self,
+        root,
+        pattern="*.txt",
+        workers=None,
+        debounce=0.2,
+        poll_interval=0.5,
+        on_result=None,
+    ):
+        self.root = root
+        self.pattern = pattern
+        self.debounce = debounce
+        self.poll_interval = poll_interval
+        self.on_result = on_result
+        self.workers = workers
+        # path -> (mtime_ns, size, sha256) последней проверенной версии
+        self.state = {}
+        # path -> None (ошибок нет) или текст ошибки
+        self.diagnostics = {}
+
+    def _changed_texts(self, paths):
+        """Тексты файлов, содержимое которых действительно изменилось."""
+        texts = {}
+        for path in paths:
+            try:
+                mtime_ns, size = fingerprint(path)
+                if self.state.get(path, (None, None))[:2] == (mtime_ns, size):
+                    continue
+                with open(path, "rb") as file:
+                    data = file.read()
+            except FileNotFoundError:
+                self.state.pop(path, None)
+                self.diagnostics.pop(path, None)
+                continue
+            digest = hashlib.sha256(data).hexdigest()
+            known = self.state.get(path)
+            self.state[path] = (mtime_ns, size, digest)
+            if known is None or known[2] != digest:
+                texts[path] = data.decode("UTF-8", errors="replace")
+        return texts
+
+    def rescan_paths(self):
+        """Все файлы каталога и ранее проверенные (для обнаружения удалённых)."""
+        return set(walk_files(self.root, self.pattern)) | set(self.state)
+
+    def revalidate(self, pool, paths):
+        """Проверка изменившихся файлов из paths; возвращает их результаты."""
+        texts = self._changed_texts(paths)
+        futures = {path: pool.submit(validate_text, text) for path, text in texts.items()}
+        results = {path: future.result() for path, future in futures.items()}
+        self.diagnostics.update(results)
+        if self.on_result:
+            for path in sorted(results):
+                self.on_result(path, results[path])
+        return results
+
+    def run(self, stop=None):
+        """Цикл наблюдения; завершается, когда stop() возвращает True."""
+        source = make_source(self.root, self.pattern, self.poll_interval)
+        try:
+            with ProcessPoolExecutor(self.workers) as pool:
+                self.revalidate(pool, walk_files(self.root, self.pattern))
+                while stop is None or not stop():
+                    pending = collect_changes(source, self.poll_interval, self.debounce)
+                    if pending is None:
+                        pending = self.rescan_paths()
+                    if pending:
+                        self.revalidate(pool, pending)
+        finally:
+            source.close()
@@ -0,0 +1,172 @@
+"""Постоянный индекс перекрёстных ссылок на переменные по корпусу программ.
+
+Каждый файл разбирается один раз; объявления, присваивания, чтения (read)
+и использования в выражениях сохраняются в базе SQLite. Повторная
+индексация пропускает файлы, у которых не изменились время модификации
+и размер, либо содержимое (по SHA-256).
+"""
+
+import argparse
+import hashlib
+import os
+import sqlite3
+from pathlib import Path
+
+from .lexer import Lexer
+from .parser import Parser
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    sha256 TEXT NOT NULL,
+    error TEXT
+);
+CREATE TABLE IF NOT EXISTS refs (
+    path TEXT NOT NULL REFERENCES files(path) ON DELETE CASCADE,
+    name TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    line INTEGER NOT NULL,
+    column INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS refs_name ON refs(name, kind);
+CREATE INDEX IF NOT EXISTS refs_path ON refs(path);
+"""
+
+
+class RecordingParser(Parser):
+    """Parser, запоминающий все обращения к переменным."""
+
+    def __init__(self, lexer):
+        self.references = []
+        super().__init__(lexer)
+
+    def reset(self, text):
+        self.references = []
+        return super().reset(text)
+
+    def reference(self, kind, token):
+        self.references.append((token.value, kind, token.line, token.column))
+
+
+class XrefIndex:
+    def __init__(self, db_path):
+        self.connection = sqlite3.connect(db_path)
+        self.connection.execute("PRAGMA foreign_keys = ON")
+        self.connection.executescript(SCHEMA)
+        self._parser = RecordingParser(Lexer(""))
+
+    def close(self):
+        self.connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def update(self, paths, prune=False):
+        """Индексация изменившихся файлов. Возвращает число переразобранных.
+
+        При prune=True из индекса удаляются файлы, отсутствующие в paths.
+        """
+        seen = set()
+        indexed = 0
+        with self.connection:
+            for path in paths:
+                path = str(Path(path).resolve())
+                seen.add(path)
+                if self._update_file(path):
+                    indexed += 1
+            if prune:
+                for (path,) in self.connection.execute("SELECT path FROM files").fetchall():
+                    if path not in seen:
+                        self.connection.execute("DELETE FROM files WHERE path = ?", (path,))
+        return indexed
+
+    def _update_file(self, path):
+        try:
+            stat = os.stat(path)
+            row = self.connection.execute(
+                "SELECT mtime_ns, size, sha256 FROM files WHERE path = ?", (path,)
+            ).fetchone()
+            if row and row[0] == stat.st_mtime_ns and row[1] == stat.st_size:
+                return False
+
+            with open(path, "rb") as file:
+                data = file.read()
+        except FileNotFoundError:
+            # Файл удалён после составления списка путей
+            self.connection.execute("DELETE FROM files WHERE path = ?", (path,))
+            return False
+        digest = hashlib.sha256(data).hexdigest()
+        if row and row[2] == digest:
+            self.connection.execute(
+                "UPDATE files SET mtime_ns = ?, size = ? WHERE path = ?",
+                (stat.st_mtime_ns, stat.st_size, path),
+            )
+            return False
+
+        error = None
+        try:
+            self._parser.reset(data.decode("UTF-8")).parse()
+        except Exception as e:
+            # Ссылки, собранные до ошибки, всё равно сохраняются
+            error = str(e)
+
+        self.connection.execute("DELETE FROM files WHERE path = ?", (path,))
+        self.connection.execute(
+            "INSERT INTO files VALUES (?, ?, ?, ?, ?)",
+            (path, stat.st_mtime_ns, stat.st_size, digest, error),
+        )
+        self.connection.executemany(
+            "INSERT INTO refs VALUES (?, ?, ?, ?, ?)",
+            ((path, *ref) for ref in self._parser.references),
+        )
+        return True
+
+    def find(self, name, kind=None):
+        """Все обращения к переменной: список (path, kind, line, column)."""
+        query = "SELECT path, kind, line, column FROM refs WHERE name = ?"
+        params = [name]
+        if kind is not None:
+            query += " AND kind = ?"
+            params.append(kind)
+        query += " ORDER BY path, line, column"
+        return self.connection.execute(query, params).fetchall()
+
+    def files(self, name, kind=None):
+        """Файлы, в которых есть обращения к переменной."""
+        return sorted({path for path, *_ in self.find(name, kind)})
+
+    def errors(self):
+        """Файлы, разбор которых завершился ошибкой: список (path, error)."""
+        return self.connection.execute(
+            "SELECT path, error FROM files WHERE error IS NOT NULL ORDER BY path"
+        ).fetchall()
+
+
+def main(argv=None):
+    arg_parser = argparse.ArgumentParser(prog="python -m parser.xref")
+    arg_parser.add_argument("--db", default="xref.sqlite3")
+    commands = arg_parser.add_subparsers(dest="command", required=True)
+    index_cmd = commands.add_parser("index")
+    index_cmd.add_argument("root")
+    index_cmd.add_argument("--pattern", default="*.txt")
+    query_cmd = commands.add_parser("query")
+    query_cmd.add_argument("name")
+    query_cmd.add_argument("--kind", choices=["declare", "assign", "read", "use"])
+    args = arg_parser.parse_args(argv)
+
+    with XrefIndex(args.db) as index:
+        if args.command == "index":
+            paths = sorted(Path(args.root).rglob(args.pattern))
+            print(f"indexed {index.update(paths, prune=True)} of {len(paths)} files")
+        else:
+            for path, kind, line, column in index.find(args.name, args.kind):
+                print(f"{path}:{line}:{column}: {kind}")
+
+
+if __name__ == "__main__":
+    main()
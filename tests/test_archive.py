@@ -0,0 +1,16 @@
+import gzip
+
+import pytest
+
+from parser.archive import validate_archives
+
+PROGRAM = b"program var x: integer; begin x as 1 /* \xff */ end."
+
+
+@pytest.mark.parametrize("workers", [0, 1])
+def test_invalid_utf8_gets_same_verdict_with_any_worker_count(tmp_path, workers):
+    path = tmp_path / "prog.txt.gz"
+    path.write_bytes(gzip.compress(PROGRAM))
+    results, summary = validate_archives([path], workers=workers)
+    assert [record["error"] for record in results] == [None]
+    assert summary["members"] == 1
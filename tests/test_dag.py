@@ -0,0 +1,66 @@
+from parser.dag import DagParser, ExprDag, build_corpus
+from parser.lexer import Lexer
+
+
+def parse(text, dag=None):
+    parser = DagParser(Lexer(text), dag)
+    parser.parse()
+    return parser
+
+
+def test_repeated_subtrees_are_shared():
+    parser = parse(
+        "program var x: integer; begin x as (x plus 1) mult (x plus 1) end."
+    )
+    (root,) = parser.roots
+    assert root.op == "mult"
+    left, right = root.children
+    assert left is right
+    # x, 1, plus и mult; повторное поддерево не создаёт узлов
+    assert len(parser.dag.nodes) == 4
+    assert parser.dag.references == 7
+
+
+def test_nodes_are_shared_across_files(tmp_path):
+    first = tmp_path / "a.txt"
+    second = tmp_path / "b.txt"
+    first.write_text("program var x: integer; begin x as x plus 1 end.")
+    second.write_text("program var x: integer; begin write(x plus 1) end.")
+    dag, errors = build_corpus([first, second])
+    assert errors == {}
+    stats = dag.stats()
+    assert stats["references"] == 6
+    assert stats["unique"] == 3
+    assert stats["dedup_ratio"] == 2.0
+    assert stats["saved_bytes"] == stats["tree_bytes"] - stats["dag_bytes"]
+
+
+def test_identifiers_are_separated_by_declared_type():
+    dag = ExprDag()
+    integer = parse("program var x: integer; begin x as x plus 1 end.", dag).roots[0]
+    real = parse("program var x: real; begin x as x plus 1 end.", dag).roots[0]
+    assert integer is not real
+    assert integer.children[0] is not real.children[0]
+    assert integer.children[1] is real.children[1]
+    assert (integer.type, real.type) == ("integer", "real")
+
+
+def test_type_and_constant_of_long_chains():
+    variables = " plus ".join(["x"] * 2000)
+    constants = " plus ".join(["1"] * 3000)
+    parser = parse(
+        f"program var x: integer; begin x as {variables}; x as {constants} end."
+    )
+    chain, folded = parser.roots
+    assert chain.type == "integer" and chain.constant is None
+    assert folded.type == "integer" and folded.constant == 3000
+
+
+def test_statement_roots_exclude_parenthesized_subexpressions():
+    parser = parse(
+        "program var x: integer; b: boolean; begin b as (x plus 1) GT 2; write(x) end."
+    )
+    assert [repr(root) for root in parser.roots] == [
+        "GT(plus(id(x), num(1)), num(2))",
+        "id(x)",
+    ]
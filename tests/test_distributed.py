@@ -0,0 +1,109 @@
+import asyncio
+import json
+import socket
+import threading
+
+from parser.distributed import Coordinator, run_worker
+
+PROGRAM = "program var x: integer; begin x as 1 end."
+
+
+def test_coordinator_survives_malformed_client(tmp_path):
+    path = tmp_path / "a.txt"
+    path.write_text(PROGRAM)
+    errors = []
+
+    def client(port):
+        with socket.create_connection(("127.0.0.1", port)) as sock:
+            sock.settimeout(5)
+            sock.sendall(b"not json\n")
+            assert sock.recv(1) == b""
+        run_worker("127.0.0.1", port, "w")
+
+    async def main():
+        loop = asyncio.get_running_loop()
+        loop.set_exception_handler(lambda loop, context: errors.append(context))
+        coordinator = Coordinator([path])
+        started = loop.create_future()
+        serving = asyncio.create_task(coordinator.serve(on_started=started.set_result))
+        worker = asyncio.create_task(asyncio.to_thread(client, await started))
+        results = await asyncio.wait_for(serving, 10)
+        await worker
+        return results
+
+    assert asyncio.run(main()) == {str(path): None}
+    assert errors == []
+
+
+def test_forged_results_do_not_complete_units(tmp_path):
+    paths = []
+    for name in ("a.txt", "b.txt"):
+        path = tmp_path / name
+        path.write_text(PROGRAM)
+        paths.append(str(path))
+
+    def forger(port):
+        with socket.create_connection(("127.0.0.1", port)) as sock:
+            sock.settimeout(5)
+            sock.sendall(b'{"type": "hello", "worker": "forger"}\n')
+            unit = json.loads(sock.makefile("rb").readline())["unit"]
+            for uid in (1 - unit, 99, unit):
+                result = {
+                    "type": "result",
+                    "unit": uid,
+                    "results": [],
+                    "bytes": 0,
+                    "seconds": 0,
+                }
+                sock.sendall((json.dumps(result) + "\n").encode())
+            # Неполный результат своей единицы исключает воркера
+            assert sock.recv(1) == b""
+        run_worker("127.0.0.1", port, "honest")
+
+    async def main():
+        loop = asyncio.get_running_loop()
+        coordinator = Coordinator(paths, unit_size=1)
+        started = loop.create_future()
+        serving = asyncio.create_task(coordinator.serve(on_started=started.set_result))
+        worker = asyncio.create_task(asyncio.to_thread(forger, await started))
+        results = await asyncio.wait_for(serving, 10)
+        await worker
+        return coordinator, results
+
+    coordinator, results = asyncio.run(main())
+    assert results == {path: None for path in paths}
+    assert coordinator.workers["honest"].units == 2
+    assert coordinator.workers["forger"].units == 0
+    assert coordinator.reassigned == 1
+
+
+def test_worker_reconnects_after_being_dropped(tmp_path):
+    path = tmp_path / "a.txt"
+    path.write_text(PROGRAM)
+    server = socket.create_server(("127.0.0.1", 0))
+    port = server.getsockname()[1]
+    hellos = []
+
+    def coordinator():
+        # Первое соединение разрывается сразу после выдачи единицы
+        for reply in (
+            {"type": "unit", "unit": 0, "paths": [str(path)]},
+            {"type": "done"},
+        ):
+            connection, _ = server.accept()
+            with connection:
+                hellos.append(json.loads(connection.makefile("rb").readline()))
+                connection.sendall((json.dumps(reply) + "\n").encode())
+        server.close()
+
+    thread = threading.Thread(target=coordinator, daemon=True)
+    thread.start()
+    run_worker("127.0.0.1", port, "w")
+    thread.join(10)
+    assert [hello["type"] for hello in hellos] == ["hello", "hello"]
+
+
+def test_worker_exits_when_coordinator_is_gone():
+    with socket.create_server(("127.0.0.1", 0)) as server:
+        port = server.getsockname()[1]
+    run_worker("127.0.0.1", port, "w")
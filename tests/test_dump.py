@@ -0,0 +1,27 @@
+import io
+
+import pytest
+
+from parser.dump import TokenDumper, dump_file
+from parser.lexer import Lexer
+
+PROGRAM = "program var x: integer; begin x as 1 end."
+
+
+def test_text_dump_matches_token_str():
+    tokens = Lexer(PROGRAM + " $ x").tokenize()
+    out = io.StringIO()
+    dumper = TokenDumper(out, "text")
+    dumper.write(tokens)
+    dumper.flush()
+    assert out.getvalue() == "".join(f"{token}\n" for token in tokens)
+
+
+def test_dump_file_flushes_tokens_before_error(tmp_path):
+    path = tmp_path / "broken.txt"
+    path.write_text(PROGRAM + " /* unterminated * comment")
+    out = io.StringIO()
+    with pytest.raises(Exception, match="incomplete multi-line comment"):
+        dump_file(path, out)
+    expected = Lexer(PROGRAM).tokenize()[:-1]  # без EOF
+    assert out.getvalue() == "".join(f"{token}\n" for token in expected)
@@ -0,0 +1,26 @@
+import pytest
+
+from parser.export import batch_to_array, tokens_to_array
+from parser.lexer import Lexer
+
+np = pytest.importorskip("numpy")
+
+
+@pytest.mark.parametrize("text", ["", "x", "ab", "program var x: integer; begin end."])
+def test_tokens_to_array_keeps_eof_column(text):
+    lexer = Lexer(text)
+    tokens = lexer.tokenize()
+    array, tables = tokens_to_array(lexer)
+    assert len(array) == len(tokens)
+    assert array["column"].tolist() == [token.column for token in tokens]
+    assert tables["values"][array["value"][-1]] == "EOF"
+
+
+def test_batch_to_array_empty_file(tmp_path):
+    empty = tmp_path / "empty.txt"
+    empty.write_text("")
+    short = tmp_path / "short.txt"
+    short.write_text("x")
+    array, tables = batch_to_array([empty, short])
+    assert array["file_id"].tolist() == [0, 1, 1]
+    assert tables["files"] == [str(empty), str(short)]
@@ -0,0 +1,98 @@
+import io
+
+import pytest
+
+from parser.interpreter import RuntimeFault, run_program
+from parser.limits import LimitError
+
+
+def run(body, declarations="x, y: integer; r: real; b: boolean", input=(), **options):
+    output = io.StringIO()
+    executor = run_program(
+        f"program var {declarations}; begin {body} end.",
+        input=input,
+        output=output,
+        **options,
+    )
+    return executor, output.getvalue().splitlines()
+
+
+def test_assignment_and_write():
+    executor, output = run("x as 7; r as x div 2; b as x GT 3; write(x, r, b)")
+    assert executor.variables == {"x": 7, "y": 0, "r": 3.5, "b": True}
+    assert output == ["7 3.5 true"]
+
+
+def test_if_else():
+    _, output = run(
+        "x as 1; if x EQ 1 then write(1) else write(2); if x NE 1 then write(3) else write(4)"
+    )
+    assert output == ["1", "4"]
+
+
+def test_for_includes_upper_bound():
+    executor, _ = run("y as 0; for x as 1 to 4 do y as y plus x")
+    assert executor.variables["y"] == 10
+    assert executor.variables["x"] == 5
+
+
+def test_while_loop():
+    executor, output = run(
+        "x as 3; while x GT 0 do [ y as y plus x; x as x min 1 ]; write(y)"
+    )
+    assert output == ["6"]
+    assert executor.variables["x"] == 0
+
+
+def test_read_converts_by_declared_type():
+    executor, _ = run("read(x, r, b)", input=["12", "2.5", "TRUE"])
+    assert (
+        executor.variables["x"],
+        executor.variables["r"],
+        executor.variables["b"],
+    ) == (12, 2.5, True)
+
+
+def test_read_without_input_is_runtime_fault():
+    with pytest.raises(RuntimeFault, match="no input for 'x'"):
+        run("read(x)")
+
+
+def test_division_by_zero_is_runtime_fault():
+    with pytest.raises(RuntimeFault, match="line 1: division by zero"):
+        run("x as 0; write(1 div x)")
+
+
+def test_max_steps_raises_limit_error():
+    with pytest.raises(LimitError, match="step budget of 50 exhausted"):
+        run("x as 1; while x GT 0 do x as x plus 1", max_steps=50)
+
+
+def test_long_expression_chain_is_evaluated_without_recursion():
+    terms = " plus ".join(["x"] * 1000)
+    _, output = run(
+        f"x as 1; write(x plus {terms}); write({' plus '.join(['1'] * 3000)})"
+    )
+    assert output == ["1001", "3000"]
+
+
+def test_profile_counts_and_iterations():
+    text = "\n".join(
+        [
+            "program var i, s: integer;",
+            "begin",
+            "    s as 0;",
+            "    for i as 1 to 5 do",
+            "        s as s plus i",
+            "end.",
+        ]
+    )
+    executor = run_program(text, output=io.StringIO(), profile=True)
+    profile = executor.profile
+    assert profile.counts == {3: 1, 4: 1, 5: 5}
+    assert profile.iterations == {4: 5}
+    lines = profile.annotate(text.split("\n")).split("\n")
+    assert len(lines) == 6
+    assert lines[4].split("|")[1].split()[0] == "5"
+    assert "5 it" in lines[3]
+    assert lines[0].split("|")[1].strip() == ""
@@ -0,0 +1,36 @@
+import pytest
+
+from parser.lexer import Lexer
+from parser.limits import LimitError, Limits
+from parser.parser import Parser
+
+
+def nested_parentheses(depth):
+    return (
+        "program var x: integer; begin x as "
+        + "(" * depth
+        + "1"
+        + ")" * depth
+        + " end."
+    )
+
+
+@pytest.mark.parametrize("limits", [None, Limits(max_depth=500), Limits(max_depth=50)])
+def test_deep_nesting_raises_limit_error(limits):
+    with pytest.raises(LimitError):
+        Parser(Lexer(nested_parentheses(300), limits)).parse()
+
+
+def test_default_depth_allows_moderate_nesting():
+    Parser(Lexer(nested_parentheses(100))).parse()
+
+
+def test_parser_uses_lexer_limits():
+    limits = Limits(max_depth=3)
+    assert Parser(Lexer("", limits)).limits is limits
+
+
+def test_timeout_covers_lexing_and_parsing():
+    text = "program var x: integer; begin " + "x as x plus 1; " * 200000 + "x as 1 end."
+    with pytest.raises(LimitError, match="time limit"):
+        Parser(Lexer(text, Limits(timeout=0.05))).parse()
@@ -0,0 +1,38 @@
+import tarfile
+
+import pytest
+
+from parser.main import main
+
+PROGRAM = b"program var x: integer; begin x as 1 end."
+
+
+@pytest.fixture
+def archive(tmp_path):
+    for name in ("a.txt", "b.pas"):
+        (tmp_path / name).write_bytes(PROGRAM)
+    path = tmp_path / "corpus.tar.gz"
+    with tarfile.open(path, "w:gz") as tar:
+        for name in ("a.txt", "b.pas"):
+            tar.add(tmp_path / name, arcname=name)
+    return path
+
+
+def test_archive_validates_every_member_by_default(archive, capsys):
+    main([str(archive), "--workers", "0"])
+    output = capsys.readouterr().out
+    assert f"{archive}:a.txt: yep" in output
+    assert f"{archive}:b.pas: yep" in output
+
+
+def test_archive_pattern_filters_members(archive, capsys):
+    main([str(archive), "--workers", "0", "--pattern", "*.pas"])
+    output = capsys.readouterr().out
+    assert "b.pas" in output and "a.txt" not in output
+
+
+@pytest.mark.parametrize("option", [["--dump", "text"], ["--memory"], ["--run"]])
+def test_archive_rejects_single_file_options(archive, option, capsys):
+    with pytest.raises(SystemExit):
+        main([str(archive), *option])
+    assert "not supported for archives" in capsys.readouterr().err
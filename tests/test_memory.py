@@ -0,0 +1,63 @@
+import sys
+import tracemalloc
+
+import pytest
+
+from parser.lexer import Lexer, Token
+from parser.memory import memory_report
+
+PROGRAM = "program var x, y: integer; begin x as 1; y as x plus 1 end."
+
+
+def test_report_layout_and_ratios():
+    report = memory_report(PROGRAM)
+    assert set(report) == {
+        "source_bytes",
+        "tokens",
+        "error",
+        "phases",
+        "structures",
+        "total",
+        "bytes_per_token",
+        "bytes_per_source_byte",
+    }
+    assert set(report["phases"]) == {"tokenize", "parse"}
+    for phase in report["phases"].values():
+        assert set(phase) == {"retained", "peak", "top"}
+    assert set(report["structures"]) == {
+        "text",
+        "text_lines",
+        "numbers_table",
+        "identifiers_table",
+        "tokens",
+        "symbol_table",
+    }
+
+    tokens = Lexer(PROGRAM).tokenize()
+    assert report["error"] is None
+    assert report["source_bytes"] == len(PROGRAM)
+    assert report["tokens"] == len(tokens)
+    assert report["total"] == sum(report["structures"].values())
+    assert report["structures"]["text_lines"] == 0
+    assert report["bytes_per_token"] == pytest.approx(
+        report["structures"]["tokens"] / len(tokens)
+    )
+    assert report["bytes_per_source_byte"] == pytest.approx(
+        report["total"] / len(PROGRAM)
+    )
+    # Каждый токен — отдельный объект Token плюс доля списка
+    assert report["bytes_per_token"] >= sys.getsizeof(Token(0, 0, 0, 0))
+
+
+def test_error_is_reported_and_text_lines_counted():
+    report = memory_report("program var x: integer; begin x as end.")
+    assert report["error"].startswith("Syntax error at line 1")
+    assert report["structures"]["text_lines"] > 0
+
+
+def test_empty_text_and_tracing_state():
+    assert not tracemalloc.is_tracing()
+    report = memory_report("")
+    assert report["error"] is not None
+    assert report["bytes_per_source_byte"] == 0.0
+    assert not tracemalloc.is_tracing()
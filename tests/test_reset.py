@@ -0,0 +1,56 @@
+from parser.lexer import Lexer
+from parser.parser import Parser
+
+BROKEN = "program var a, b: integer; begin [ [ a as (b plus 12 mult ( end."
+PROGRAM = "program var x: integer; begin x as 3 end."
+
+
+def test_reset_after_failed_parse_clears_state():
+    parser = Parser(Lexer(BROKEN))
+    try:
+        parser.parse()
+    except Exception:
+        pass
+    else:
+        raise AssertionError("broken program parsed")
+    assert parser.depth > 0
+    assert parser.symbol_table.scopes
+
+    parser.reset(PROGRAM)
+    assert parser.depth == 0
+    assert parser.expression_level == 0
+    assert parser.symbol_table.scopes == []
+    assert parser.symbol_table.symbols == {}
+    assert parser.lexer.identifiers_table == ["x"]
+    assert parser.lexer.numbers_table == ["3"]
+    assert parser.current_token_index == 0
+    parser.parse()
+
+
+def test_reset_keeps_earlier_token_lists_intact():
+    lexer = Lexer(BROKEN)
+    first = lexer.tokenize()
+    snapshot = [
+        (token.table_num, token.lexeme_num, token.line, token.column, token.value)
+        for token in first
+    ]
+    second = lexer.reset(PROGRAM).tokenize()
+    assert second is not first
+    assert [
+        (token.table_num, token.lexeme_num, token.line, token.column, token.value)
+        for token in first
+    ] == snapshot
+    assert [token.value for token in second][-1] == "EOF"
+
+
+def test_reused_pair_gives_same_tokens_as_fresh_one():
+    parser = Parser(Lexer(BROKEN))
+    for text in (PROGRAM, BROKEN, PROGRAM):
+        pooled = parser.reset(text).tokens
+        fresh_lexer = Lexer(text)
+        fresh = fresh_lexer.tokenize()
+        assert [
+            (token.table_num, token.lexeme_num, token.value) for token in pooled
+        ] == [(token.table_num, token.lexeme_num, token.value) for token in fresh]
+        assert parser.lexer.identifiers_table == fresh_lexer.identifiers_table
+        assert parser.lexer.numbers_table == fresh_lexer.numbers_table
@@ -0,0 +1,35 @@
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+SCRIPT = """
+import sys
+from parser.shm import SharedPipeline
+
+results = SharedPipeline(2, 2).run(sys.argv[1:])
+print(sorted(error is None for error in results.values()))
+"""
+
+
+def test_pipeline_runs_without_resource_tracker_warnings(tmp_path):
+    paths = []
+    for i in range(4):
+        path = tmp_path / f"p{i}.txt"
+        path.write_text("program var x: integer; begin x as 1 end.")
+        paths.append(str(path))
+    bad = tmp_path / "bad.txt"
+    bad.write_text("program var x: integer; begin x as end.")
+    paths.append(str(bad))
+
+    result = subprocess.run(
+        [sys.executable, "-c", SCRIPT, *paths],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        timeout=60,
+    )
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip() == "[False, True, True, True, True]"
+    assert result.stderr == ""
@@ -0,0 +1,49 @@
+import asyncio
+import subprocess
+import sys
+from pathlib import Path
+
+from parser.stream import validate_stream
+
+ROOT = Path(__file__).resolve().parent.parent
+PROGRAM = b"program var x: integer; begin x as 1 end."
+
+# Читатель получает начало программы, а остальное так и не приходит.
+# asyncio.run ждёт потоки исполнителя при выходе, поэтому зависший поток
+# разбора не даёт процессу завершиться.
+STALLED_READER = """
+import asyncio
+from parser.stream import validate_stream
+
+async def main():
+    reader = asyncio.StreamReader()
+    reader.feed_data(b"program var x: integer; ")
+    try:
+        await asyncio.wait_for(validate_stream(reader), 0.1)
+    except asyncio.TimeoutError:
+        print("timeout")
+
+asyncio.run(main())
+"""
+
+
+def test_validate_stream_accepts_chunked_program():
+    async def main():
+        reader = asyncio.StreamReader()
+        for start in range(0, len(PROGRAM), 5):
+            reader.feed_data(PROGRAM[start : start + 5])
+        reader.feed_eof()
+        return await validate_stream(reader, chunk_size=5)
+
+    assert asyncio.run(main()) is None
+
+
+def test_validate_stream_timeout_releases_parser_thread():
+    result = subprocess.run(
+        [sys.executable, "-c", STALLED_READER],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        timeout=30,
+    )
+    assert result.stdout.strip() == "timeout", result.stderr
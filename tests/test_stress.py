@@ -0,0 +1,36 @@
+import pytest
+
+from parser.lexer import Lexer
+from parser.limits import LimitError
+from parser.parser import Parser
+from parser.stress import MAX_SLOPE, SCENARIOS, growth
+
+# Замеры времени шумят на загруженной машине: сценарий проходит, если
+# хотя бы одна из попыток показывает линейный рост
+ATTEMPTS = 3
+
+DEEP = 10000
+DEEP_PROGRAMS = {
+    "parentheses": f"program var x: integer; begin x as {'(' * DEEP}1{')' * DEEP} end.",
+    "unary": f"program var x: boolean; begin x as {'~' * DEEP}true end.",
+    "compound": f"program var x: integer; begin {'[' * DEEP}x as 1{']' * DEEP} end.",
+    "if": f"program var x: boolean; begin {'if x then ' * DEEP}x as true end.",
+    "while": f"program var x: boolean; begin {'while x do ' * DEEP}x as true end.",
+}
+
+
+@pytest.mark.parametrize("scenario", SCENARIOS, ids=lambda scenario: scenario.__name__)
+def test_growth_is_linear(scenario):
+    slopes = []
+    for _ in range(ATTEMPTS):
+        _, slope = growth(scenario, SCENARIOS[scenario])
+        if slope <= MAX_SLOPE:
+            return
+        slopes.append(round(slope, 2))
+    pytest.fail(f"{scenario.__name__} grows super-linearly: slopes {slopes}")
+
+
+@pytest.mark.parametrize("text", DEEP_PROGRAMS.values(), ids=DEEP_PROGRAMS)
+def test_deep_nesting_is_rejected_with_limit_error(text):
+    with pytest.raises(LimitError, match="nesting depth"):
+        Parser(Lexer(text)).parse()
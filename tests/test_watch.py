@@ -0,0 +1,120 @@
+import os
+import shutil
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from parser.watch import InotifySource, PollingSource, Watcher, collect_changes
+
+PROGRAM = "program var x: integer; begin x as 1 end."
+BROKEN = "program var x: integer; begin x as end."
+
+
+def test_polling_source_reports_only_changed_matching_files(tmp_path):
+    program = tmp_path / "a.txt"
+    other = tmp_path / "notes.md"
+    program.write_text(PROGRAM)
+    other.write_text("notes")
+    source = PollingSource(str(tmp_path), "*.txt", interval=0.01)
+    assert source.wait(0) == set()
+
+    other.write_text("more notes")
+    assert source.wait(0) == set()
+
+    program.write_text(PROGRAM + " ")
+    assert source.wait(0) == {str(program)}
+    assert source.wait(0) == set()
+
+    program.unlink()
+    assert source.wait(0) == {str(program)}
+
+
+def test_debounce_merges_a_burst_of_changes(tmp_path):
+    source = PollingSource(str(tmp_path), "*.txt", interval=0.02)
+    (tmp_path / "a.txt").write_text(PROGRAM)
+
+    def burst():
+        for name in ("b.txt", "c.txt"):
+            time.sleep(0.1)
+            (tmp_path / name).write_text(PROGRAM)
+
+    writer = threading.Thread(target=burst)
+    writer.start()
+    started = time.monotonic()
+    changed = collect_changes(source, 1.0, debounce=0.4)
+    writer.join()
+    assert changed == {str(tmp_path / name) for name in ("a.txt", "b.txt", "c.txt")}
+    assert time.monotonic() - started >= 0.6
+
+
+def test_collect_changes_propagates_rescan_request():
+    class ScriptedSource:
+        def __init__(self, answers):
+            self.answers = list(answers)
+
+        def wait(self, timeout):
+            return self.answers.pop(0) if self.answers else set()
+
+    assert collect_changes(ScriptedSource([set()]), 0, 0.01) == set()
+    assert collect_changes(ScriptedSource([{"a"}, None]), 0, 0.01) is None
+    assert collect_changes(ScriptedSource([{"a"}, {"b"}]), 0, 0.01) == {"a", "b"}
+
+
+def test_revalidate_skips_unchanged_content_and_drops_deleted_files(tmp_path):
+    path = tmp_path / "a.txt"
+    path.write_text(PROGRAM)
+    reported = []
+    watcher = Watcher(
+        str(tmp_path), on_result=lambda path, error: reported.append(path)
+    )
+    key = str(path)
+    with ThreadPoolExecutor(1) as pool:
+        assert watcher.revalidate(pool, watcher.rescan_paths()) == {key: None}
+
+        path.write_text(BROKEN)
+        results = watcher.revalidate(pool, [key])
+        assert "Syntax error" in results[key]
+        assert watcher.diagnostics[key] == results[key]
+
+        # Время изменилось, содержимое — нет: повторной проверки нет
+        stat = os.stat(path)
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        assert watcher.revalidate(pool, [key]) == {}
+        assert watcher.state[key][0] == stat.st_mtime_ns + 10**9
+
+        path.unlink()
+        assert watcher.revalidate(pool, watcher.rescan_paths()) == {}
+    assert key not in watcher.diagnostics
+    assert key not in watcher.state
+    assert reported == [key, key]
+
+
+@pytest.mark.parametrize("remove", ["move", "delete"])
+def test_directory_removed_from_tree_is_pruned(tmp_path, remove):
+    root = tmp_path / "root"
+    (root / "sub" / "deeper").mkdir(parents=True)
+    path = root / "sub" / "deeper" / "a.txt"
+    path.write_text(PROGRAM)
+    try:
+        source = InotifySource(str(root), "*.txt")
+    except (OSError, AttributeError, TypeError):
+        pytest.skip("inotify is not available")
+    watcher = Watcher(str(root))
+    try:
+        with ThreadPoolExecutor(1) as pool:
+            watcher.revalidate(pool, watcher.rescan_paths())
+            assert str(path) in watcher.diagnostics
+
+            if remove == "move":
+                os.rename(root / "sub", tmp_path / "outside")
+            else:
+                shutil.rmtree(root / "sub")
+            assert source.wait(1.0) is None
+            assert set(source.directories.values()) == {str(root)}
+            watcher.revalidate(pool, watcher.rescan_paths())
+    finally:
+        source.close()
+    assert watcher.diagnostics == {}
+    assert watcher.state == {}
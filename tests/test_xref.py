@@ -0,0 +1,21 @@
+from parser.xref import XrefIndex
+
+PROGRAM = "program var x: integer; begin x as 1 end."
+
+
+def test_update_skips_missing_file(tmp_path):
+    present = tmp_path / "a.txt"
+    present.write_text(PROGRAM)
+    with XrefIndex(":memory:") as index:
+        assert index.update([present, tmp_path / "gone.txt"]) == 1
+        assert index.files("x") == [str(present.resolve())]
+
+
+def test_update_removes_deleted_file(tmp_path):
+    path = tmp_path / "a.txt"
+    path.write_text(PROGRAM)
+    with XrefIndex(":memory:") as index:
+        index.update([path])
+        path.unlink()
+        assert index.update([path]) == 0
+        assert index.find("x") == []